@@ -0,0 +1,25 @@
+"""Gunicorn settings for the production image.
+
+Gunicorn supervises several Uvicorn worker processes so the API can use
+more than one CPU core. Values can be tuned with environment variables.
+"""
+
+import os
+
+from uvicorn_worker import UvicornWorker
+
+
+class QuietUvicornWorker(UvicornWorker):
+    """Uvicorn worker with per-request access logging turned off."""
+
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "access_log": False}
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Default follows the usual ``2 * cores + 1`` rule of thumb.
+workers = int(os.getenv("UVICORN_WORKERS") or (os.cpu_count() or 1) * 2 + 1)
+worker_class = "gunicorn_conf.QuietUvicornWorker"
+keepalive = 5
+
+loglevel = os.getenv("LOG_LEVEL", "info")
@@ -1,18 +1,34 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from fastapi.middleware.cors import CORSMiddleware
 from src.api import contacts, utils, users
 from src.conf.limiter import register_rate_limit_handler
 from src.conf.config import config
+from src.cache.redis_client import close_redis
 import uvicorn
 
 
-app = FastAPI()
-origins = [origin.strip() for origin in config.ORIGINS]
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the shared Redis connection pool when the worker shuts down."""
+    yield
+    await close_redis()
+
+
+app = FastAPI(
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+    docs_url="/docs" if config.DOCS_ENABLED else None,
+    redoc_url="/redoc" if config.DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if config.DOCS_ENABLED else None,
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origins=config.ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -34,4 +50,12 @@ def health_check():
 
 if __name__ == "__main__":
 
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        # "auto" picks uvloop where it is installed (not on Windows)
+        loop="auto",
+        http="httptools",
+        reload=True,
+    )
@@ -0,0 +1,36 @@
+"""Add contacts birthday month/day index
+
+Revision ID: 5c0e8f2a9b41
+Revises: d411e763bb23
+Create Date: 2026-10-15 10:12:04.318225
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e8f2a9b41'
+down_revision: Union[str, Sequence[str], None] = 'd411e763bb23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_contacts_user_birth_mmdd',
+        'contacts',
+        [
+            'user_id',
+            sa.text('(EXTRACT(month FROM birth_date) * 100 + EXTRACT(day FROM birth_date))'),
+        ],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_birth_mmdd', table_name='contacts')
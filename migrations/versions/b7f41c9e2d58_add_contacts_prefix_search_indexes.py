@@ -0,0 +1,37 @@
+"""Add lower() pattern indexes for prefix contact search
+
+Revision ID: b7f41c9e2d58
+Revises: 8e3b6d1f0c27
+Create Date: 2026-10-15 11:03:52.614870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f41c9e2d58'
+down_revision: Union[str, Sequence[str], None] = '8e3b6d1f0c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('name', 'last_name', 'email')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        op.create_index(
+            f'ix_contacts_{column}_lower',
+            'contacts',
+            [sa.text(f'lower({column}) text_pattern_ops')],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in COLUMNS:
+        op.drop_index(f'ix_contacts_{column}_lower', table_name='contacts')
@@ -0,0 +1,29 @@
+"""Drop users.refresh_token
+
+Revision ID: f3b8d2a61c47
+Revises: e2a9c4d7f613
+Create Date: 2026-10-15 21:40:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2a61c47'
+down_revision: Union[str, Sequence[str], None] = 'e2a9c4d7f613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Refresh sessions are tracked by jti in Redis; the column is unused.
+    op.drop_column('users', 'refresh_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('users', sa.Column('refresh_token', sa.String(length=255), nullable=True))
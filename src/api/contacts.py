@@ -3,16 +3,21 @@
 This module exposes REST endpoints for managing contact records. Each
 operation is protected by authentication and delegates business logic to
 ``src.services.contacts.ContactsService``.
+
+List endpoints return pre-serialized payloads as :class:`ORJSONResponse`;
+``response_model`` is kept on them for the OpenAPI schema only, since
+FastAPI skips response validation when a ``Response`` is returned.
 """
 
 from typing import List
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import User
-from src.services.auth import get_current_user
+from src.services.auth import get_current_user_id
 from src.database.db import get_db
-from src.schemas import ContactResponseModel, ContactModel
+from src.schemas import ContactResponseModel, ContactModel, ContactSummaryModel
 from src.services.contacts import ContactsService
 
 
@@ -26,7 +31,8 @@ async def get_contacts(
     name: str | None = None,
     last_name: str | None = None,
     email: str | None = None,
-    user: User = Depends(get_current_user),
+    prefix: bool = False,
+    user: User = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Return a paginated list of contacts for the current user.
@@ -37,25 +43,65 @@ async def get_contacts(
         name (str | None): Optional name filter.
         last_name (str | None): Optional last name filter.
         email (str | None): Optional email filter.
+        prefix (bool): Match filters as prefixes ("starts with") instead of
+            substrings.
         user (User): Authenticated user (injected).
         db (AsyncSession): Database session (injected).
 
     Returns:
-        list[ContactResponseModel]: List of contact response models.
+        ORJSONResponse: Serialized list of contacts, served from the Redis
+            list cache when available.
     """
 
     contacts_service = ContactsService(db)
     contacts = await contacts_service.get_contacts(
-        user, skip, limit, name, last_name, email
+        user, skip, limit, name, last_name, email, prefix
     )
-    return contacts
+    return ORJSONResponse(contacts)
+
+
+@router.get("/summary", response_model=List[ContactSummaryModel])
+async def get_contacts_summary(
+    skip: int = 0,
+    limit: int = 100,
+    name: str | None = None,
+    last_name: str | None = None,
+    email: str | None = None,
+    prefix: bool = False,
+    user: User = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return a paginated list of contacts with list-view fields only.
+
+    Accepts the same filters as :func:`get_contacts` but returns only
+    ``id``, ``name``, ``last_name``, ``email`` and ``phone``.
+
+    Args:
+        skip (int): Offset for pagination.
+        limit (int): Maximum number of results.
+        name (str | None): Optional name filter.
+        last_name (str | None): Optional last name filter.
+        email (str | None): Optional email filter.
+        prefix (bool): Match filters as prefixes instead of substrings.
+        user (User): Authenticated user (injected).
+        db (AsyncSession): Database session (injected).
+
+    Returns:
+        ORJSONResponse: Serialized list of contact summaries.
+    """
+
+    contacts_service = ContactsService(db)
+    contacts = await contacts_service.get_contacts_summary(
+        user, skip, limit, name, last_name, email, prefix
+    )
+    return ORJSONResponse(contacts)
 
 
 @router.get("/upcoming", response_model=List[ContactResponseModel])
 async def get_upcoming_birthdays(
     days: int = 7,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_id),
 ):
     """Return contacts whose birthdays occur within the next `days` days.
 
@@ -65,18 +111,24 @@ async def get_upcoming_birthdays(
         user (User): Authenticated user (injected).
 
     Returns:
-        list[ContactResponseModel]: Contacts with upcoming birthdays.
+        ORJSONResponse: Serialized contacts with upcoming birthdays.
     """
 
     contacts_service = ContactsService(db)
-    return await contacts_service.get_upcoming_birthdays(user, days)
+    contacts = await contacts_service.get_upcoming_birthdays(user, days)
+    return ORJSONResponse(
+        [
+            ContactResponseModel.model_validate(c).model_dump(mode="json")
+            for c in contacts
+        ]
+    )
 
 
 @router.get("/{contact_id}", response_model=ContactResponseModel | None)
 async def get_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_id),
 ):
     """Return a single contact by id for the authenticated user.
 
@@ -97,7 +149,7 @@ async def get_contact(
 async def create_contact(
     body: ContactModel,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_id),
 ):
     """Create a new contact for the authenticated user.
 
@@ -119,7 +171,7 @@ async def update_contact(
     contact_id: int,
     body: ContactModel,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_id),
 ):
     """Update an existing contact owned by the authenticated user.
 
@@ -141,7 +193,7 @@ async def update_contact(
 async def delete_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_id),
 ):
     """Delete a contact owned by the authenticated user.
 
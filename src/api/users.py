@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import (
     APIRouter,
     Depends,
@@ -8,29 +10,40 @@ from fastapi import (
     UploadFile,
     File,
 )
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from src.schemas import RequestEmail, UserCreate, Token, User, TokenRefreshRequest
 from src.services.auth import (
+    access_token_claims,
     create_access_token,
     create_refresh_token,
+    new_refresh_jti,
     verify_refresh_token,
     Hash,
-    get_current_user,
+    get_cached_user,
     get_current_admin_user,
+    get_jwt_claims,
+)
+from src.cache.user_cache import (
+    set_user_cache,
+    set_user_cache_field,
+    set_user_session,
+    user_to_cache,
 )
-from src.cache.user_cache import set_user_cache, delete_user_cache
 from src.schemas import User
 from src.services.mail import send_email
 from src.services.mail import send_password_reset_email
+from src.services.mail_queue import enqueue_email
 from src.services.auth import get_email_from_password_reset_token
 from src.schemas import ResetPasswordRequest, ResetPasswordConfirm
 from src.services.upload_file import UploadFileService
 from src.services.users import UserService
 from src.database.db import get_db
 from src.services.auth import get_email_from_token
-from src.conf.limiter import limiter
+from src.conf.limiter import rate_limit
 from src.conf.config import config
+from src.cache.metrics import cache_stats
 
 """Authentication and user-related API endpoints.
 
@@ -40,13 +53,21 @@ email confirmation flows, and avatar upload.
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+logger = logging.getLogger(__name__)
+
+# Cloudinary is configured once at import; the service holds no per-request state.
+upload_service = UploadFileService(
+    config.CLOUDINARY_NAME, config.CLOUDINARY_API_KEY, config.CLOUDINARY_API_SECRET
+)
+
 
 def get_base_url(request: Request) -> str:
     """Construct a base URL using upstream proxy headers when present.
 
     Uses `X-Forwarded-Proto` and the `Host` header if available (common when
     running behind a reverse proxy such as Koyeb). Falls back to
-    `str(request.base_url)` when headers are absent.
+    `str(request.base_url)` when headers are absent. Endpoints receive the
+    result via ``Depends(get_base_url)`` so they get a ready-made string.
     """
     # Prefer forwarded proto (https/http) if provided by the proxy
     forwarded_proto = request.headers.get("x-forwarded-proto")
@@ -60,19 +81,19 @@ def get_base_url(request: Request) -> str:
 async def register_user(
     user_data: UserCreate,
     background_tasks: BackgroundTasks,
-    request: Request,
+    host: str = Depends(get_base_url),
     db: AsyncSession = Depends(get_db),
 ):
     """Register a new user and send an email verification task.
 
     Performs uniqueness checks on username and email, hashes the password,
-    creates the user, and enqueues an email verification task in the
-    background tasks.
+    creates the user, and enqueues an email verification task (on the Redis
+    mail queue when enabled, otherwise in the background tasks).
 
     Args:
         user_data (UserCreate): Incoming user creation payload.
-        background_tasks (BackgroundTasks): FastAPI background task runner.
-        request (Request): FastAPI request object (used to determine host).
+        background_tasks (BackgroundTasks): Fallback task runner for the email.
+        host (str): Public base URL used in the verification link (injected).
         db (AsyncSession): Database session (injected).
 
     Returns:
@@ -81,23 +102,24 @@ async def register_user(
 
     user_service = UserService(db)
 
-    email_user = await user_service.get_user_by_email(user_data.email)
-    if email_user:
+    existing_user = await user_service.get_user_by_email_or_username(
+        user_data.email, user_data.username
+    )
+    if existing_user and existing_user.email == user_data.email:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A user with this email already exists",
         )
-
-    username_user = await user_service.get_user_by_username(user_data.username)
-    if username_user:
+    if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A user with this username already exists",
         )
-    user_data.password = Hash().get_password_hash(user_data.password)
+    user_data.password = await Hash().get_password_hash(user_data.password)
     new_user = await user_service.create_user(user_data)
-    host = get_base_url(request)
-    background_tasks.add_task(send_email, new_user.email, new_user.username, host)
+    await enqueue_email(
+        background_tasks, send_email, new_user.email, new_user.username, host
+    )
     return new_user
 
 
@@ -108,6 +130,8 @@ async def login_user(
     """Authenticate a user and return an access token.
 
     Validates credentials and confirmed email status before issuing a JWT.
+    The refresh token is stored in Redis only, so login performs no
+    database write unless a legacy password hash is upgraded.
 
     Args:
         form_data (OAuth2PasswordRequestForm): Form data containing username/password.
@@ -115,11 +139,18 @@ async def login_user(
 
     Returns:
         dict: Token response with ``access_token`` and ``token_type``.
+
+    Raises:
+        HTTPException: 401 for bad credentials or an unverified email, 503
+            if the session cannot be stored in Redis.
     """
 
     user_service = UserService(db)
+    hasher = Hash()
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    if not user or not await hasher.verify_password(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
@@ -130,27 +161,28 @@ async def login_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email address not verified",
         )
+    if hasher.needs_rehash(user.hashed_password):
+        # Upgrade legacy bcrypt (or outdated argon2) hashes transparently
+        await user_service.upgrade_password_hash(
+            user, await hasher.get_password_hash(form_data.password)
+        )
 
-    access_token = await create_access_token(data={"sub": user.username})
-    refresh_token = await create_refresh_token(data={"sub": user.username})
-    user.refresh_token = refresh_token
+    claims = access_token_claims(user)
+    access_token = create_access_token(data=claims)
+    refresh_jti = new_refresh_jti()
+    refresh_token = create_refresh_token(data={**claims, "jti": refresh_jti})
 
     try:
-        await set_user_cache(
-            {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "avatar": user.avatar or "",
-                "confirmed": bool(user.confirmed),
-                "role": user.role,
-                "refresh_token": user.refresh_token,
-            }
-        )
+        await set_user_session(user_to_cache(user), refresh_jti)
     except Exception:
-
-        pass
-    await db.commit()
+        # The refresh token's jti lives only in Redis; without it the token
+        # could never be refreshed, so do not hand it out.
+        logger.exception("Could not store the session of %s", user.username)
+        cache_stats["session_store_error"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login is temporarily unavailable",
+        )
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -184,7 +216,7 @@ async def new_token(request: TokenRefreshRequest, db: AsyncSession = Depends(get
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
-    new_access_token = await create_access_token(data={"sub": user.username})
+    new_access_token = create_access_token(data=access_token_claims(user))
     return {
         "access_token": new_access_token,
         "refresh_token": request.refresh_token,
@@ -192,16 +224,35 @@ async def new_token(request: TokenRefreshRequest, db: AsyncSession = Depends(get
     }
 
 
-@router.get("/me", response_model=User)
-@limiter.limit("5/minute")
-@limiter.limit("1/second")
-async def me(request: Request, user: User = Depends(get_current_user)):
+@router.get(
+    "/me",
+    # The cached payload is sent as-is, so the model only documents it.
+    response_class=ORJSONResponse,
+    responses={200: {"model": User}},
+    dependencies=[Depends(rate_limit("me", "5/minute", "1/second"))],
+)
+async def me(
+    claims: dict = Depends(get_jwt_claims),
+    db: AsyncSession = Depends(get_db),
+):
     """Return the currently authenticated user.
 
-    Rate-limited endpoint that returns the authenticated user's data.
+    Rate-limited endpoint that returns the authenticated user's data. The
+    cached user payload is returned without model validation, so a cache
+    hit costs one Redis lookup; the database is only read on a miss. The
+    cache stores a missing avatar as ``""``; it is sent as ``null``.
     """
 
-    return user
+    user = await get_cached_user(claims["sub"], db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not user["avatar"]:
+        user["avatar"] = None
+    return ORJSONResponse(user)
 
 
 @router.get("/confirmed_email/{token}")
@@ -216,7 +267,7 @@ async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
         dict: Message indicating verification status.
     """
 
-    email = await get_email_from_token(token)
+    email = get_email_from_token(token)
     user_service = UserService(db)
     user = await user_service.get_user_by_email(email)
     if user is None:
@@ -228,16 +279,7 @@ async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     await user_service.confirmed_email(email)
 
     try:
-        await set_user_cache(
-            {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "avatar": user.avatar or "",
-                "confirmed": True,
-                "role": user.role,
-            }
-        )
+        await set_user_cache({**user_to_cache(user), "confirmed": True})
     except Exception:
         pass
     return {"message": "Email has been verified"}
@@ -247,7 +289,7 @@ async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
 async def request_email(
     body: RequestEmail,
     background_tasks: BackgroundTasks,
-    request: Request,
+    host: str = Depends(get_base_url),
     db: AsyncSession = Depends(get_db),
 ):
     """Request a new verification email for the provided address.
@@ -257,7 +299,7 @@ async def request_email(
     Args:
         body (RequestEmail): Payload containing the email address.
         background_tasks (BackgroundTasks): Background task runner.
-        request (Request): FastAPI request (used to build base URL).
+        host (str): Public base URL used in the verification link (injected).
         db (AsyncSession): Database session (injected).
 
     Returns:
@@ -270,8 +312,8 @@ async def request_email(
     if user and user.confirmed:
         return {"message": "Your email is already verified"}
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, get_base_url(request)
+        await enqueue_email(
+            background_tasks, send_email, user.email, user.username, host
         )
     return {"message": "Please check your email to confirm"}
 
@@ -280,7 +322,7 @@ async def request_email(
 async def request_password_reset(
     body: ResetPasswordRequest,
     background_tasks: BackgroundTasks,
-    request: Request,
+    host: str = Depends(get_base_url),
     db: AsyncSession = Depends(get_db),
 ):
     """Request a password-reset email.
@@ -293,9 +335,8 @@ async def request_password_reset(
     user = await user_service.get_user_by_email(body.email)
 
     if user:
-        host = get_base_url(request)
-        background_tasks.add_task(
-            send_password_reset_email, user.email, user.username, host
+        await enqueue_email(
+            background_tasks, send_password_reset_email, user.email, user.username, host
         )
     return {"message": "If an account with that email exists, check your inbox"}
 
@@ -309,7 +350,7 @@ async def reset_password(
     The token encodes the target email; if valid, the user's password is updated.
     """
 
-    email = await get_email_from_password_reset_token(body.token)
+    email = get_email_from_password_reset_token(body.token)
     user_service = UserService(db)
     user = await user_service.get_user_by_email(email)
     if user is None:
@@ -317,13 +358,8 @@ async def reset_password(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token or user"
         )
 
-    hashed = Hash().get_password_hash(body.new_password)
-    updated_user = await user_service.update_password(email, hashed)
-
-    try:
-        await delete_user_cache(user.username)
-    except Exception:
-        pass
+    hashed = await Hash().get_password_hash(body.new_password)
+    await user_service.update_password(email, hashed)
 
     return {"message": "Password has been reset successfully"}
 
@@ -345,9 +381,7 @@ async def update_avatar_user(
         User: Updated user model with new avatar URL.
     """
 
-    avatar_url = UploadFileService(
-        config.CLOUDINARY_NAME, config.CLOUDINARY_API_KEY, config.CLOUDINARY_API_SECRET
-    ).upload_file(file, user.username)
+    avatar_url = await upload_service.upload_file(file, user.username)
 
     user_service = UserService(db)
     updated_user = await user_service.update_avatar_url(user.email, avatar_url)
@@ -358,15 +392,8 @@ async def update_avatar_user(
         )
 
     try:
-        await set_user_cache(
-            {
-                "id": updated_user.id,
-                "username": updated_user.username,
-                "email": updated_user.email,
-                "avatar": updated_user.avatar or "",
-                "confirmed": bool(updated_user.confirmed),
-                "role": updated_user.role,
-            }
+        await set_user_cache_field(
+            updated_user.username, "avatar", updated_user.avatar or ""
         )
     except Exception:
         pass
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.database.db import get_db
+from src.database.db import get_db, sessionmanager
+from src.services.auth import get_current_admin_user
 
 router = APIRouter(tags=["utils"])
 
@@ -26,3 +27,13 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
         )
+
+
+@router.get(
+    "/debug/pool",
+    include_in_schema=False,
+    dependencies=[Depends(get_current_admin_user)],
+)
+async def pool_status():
+    """Report this worker's database connection pool usage (admins only)."""
+    return {"pool": sessionmanager.pool_status()}
@@ -0,0 +1,60 @@
+import orjson
+from typing import Optional
+
+from src.cache.redis_client import get_redis
+from src.conf.config import config
+
+
+def _index_key(user_id: int) -> str:
+    return f"contacts:{user_id}:keys"
+
+
+def contacts_list_key(
+    user_id: int,
+    skip: int,
+    limit: int,
+    name: str | None = None,
+    last_name: str | None = None,
+    email: str | None = None,
+    prefix: bool = False,
+    view: str = "full",
+) -> str:
+    """Build the cache key for one page of a user's contact list.
+
+    ``view`` separates the full list from the column-subset summary list.
+    """
+    params = orjson.dumps([skip, limit, name, last_name, email, prefix]).decode()
+    return f"contacts:{user_id}:{view}:{params}"
+
+
+async def get_contacts_cache(key: str) -> Optional[list[dict]]:
+    """Return a cached contact list page or None."""
+    r = get_redis()
+    val = await r.get(key)
+    if val is None:
+        return None
+    try:
+        return orjson.loads(val)
+    except orjson.JSONDecodeError:
+        return None
+
+
+async def set_contacts_cache(user_id: int, key: str, contacts: list[dict]) -> None:
+    """Store a contact list page and register its key in the user's index set."""
+    r = get_redis()
+    index = _index_key(user_id)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.set(key, orjson.dumps(contacts), ex=config.CONTACTS_CACHE_TTL)
+        pipe.sadd(index, key)
+        pipe.expire(index, config.CONTACTS_CACHE_TTL)
+        await pipe.execute()
+
+
+async def invalidate_contacts_cache(user_id: int) -> None:
+    """Drop every cached contact list page of a user."""
+    r = get_redis()
+    index = _index_key(user_id)
+    keys = await r.smembers(index)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.delete(index, *keys)
+        await pipe.execute()
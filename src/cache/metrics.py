@@ -0,0 +1,5 @@
+from collections import Counter
+
+# Per-process hit/miss counters for the in-memory and Redis caches, e.g.
+# ``jwt_hit``/``jwt_miss`` and ``user_local_hit``/``user_redis_hit``/``user_miss``.
+cache_stats: Counter = Counter()
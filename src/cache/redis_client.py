@@ -1,34 +1,47 @@
-from typing import Dict
-import asyncio
+from typing import Optional
+
 import redis.asyncio as aioredis
 
 from src.conf.config import config
 
 
-_clients: Dict[int, aioredis.Redis] = {}
+_client: Optional[aioredis.Redis] = None
+
+
+def _create_pool() -> aioredis.ConnectionPool:
+    """Build a bounded connection pool shared by every cache command."""
+    return aioredis.ConnectionPool(
+        host=config.REDIS_HOST,
+        port=config.REDIS_PORT,
+        username="default",
+        password=config.REDIS_PASSWORD,
+        max_connections=config.REDIS_MAX_CONNECTIONS,
+    )
 
 
 def get_redis() -> aioredis.Redis:
-    """Return an asyncio Redis client scoped to the current event loop.
+    """Return the process-wide asyncio Redis client.
+
+    The client is created lazily on first use and backed by an explicit
+    :class:`redis.asyncio.ConnectionPool`, so sockets are reused across
+    requests instead of being opened per call. Replies are returned as raw
+    bytes (no ``decode_responses``) so callers can hand them straight to
+    ``orjson``. Uvicorn runs one event loop per worker process, so a single
+    client per process is enough.
+    """
+    global _client
+    if _client is None:
+        _client = aioredis.Redis(connection_pool=_create_pool())
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared client and its pool, if one was created.
 
-    If no running event loop is available, return a transient client.
+    Called on application shutdown and from tests that run on short-lived
+    event loops, since asyncio connections cannot outlive their loop.
     """
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        return aioredis.from_url(
-            config.REDIS_URL, encoding="utf-8", decode_responses=True
-        )
-
-    key = id(loop)
-    client = _clients.get(key)
-    if client is None:
-        client = aioredis.Redis(
-            host=config.REDIS_HOST,
-            port=config.REDIS_PORT,
-            decode_responses=True,
-            username="default",
-            password=config.REDIS_PASSWORD,
-        )
-        _clients[key] = client
-    return client
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
@@ -1,32 +1,159 @@
-import json
+from enum import Enum
 from typing import Optional
 
+from cachetools import TTLCache
+
+from src.cache.metrics import cache_stats
 from src.cache.redis_client import get_redis
 from src.conf.config import config
 
+# Process-local copy of recently used users in front of Redis. Every write
+# helper below drops the entry in this worker; other workers see the change
+# once their USER_LOCAL_CACHE_TTL (a couple of seconds) runs out. Entries are
+# shared between requests, so callers only ever get copies.
+_local_users: TTLCache = TTLCache(maxsize=10_000, ttl=config.USER_LOCAL_CACHE_TTL)
+
+
+def _user_key(username: str) -> str:
+    """Redis key of a cached user.
+
+    Versioned because entries used to be JSON strings under ``user:{name}``;
+    hash commands on those raise WRONGTYPE until they expire.
+    """
+    return f"user:v2:{username}"
+
+
+_REQUIRED_FIELDS = frozenset(
+    ("id", "username", "email", "avatar", "confirmed", "role")
+)
+
+
+def user_to_cache(user) -> dict:
+    """Build the cached representation of a user model instance."""
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "avatar": user.avatar or "",
+        "confirmed": bool(user.confirmed),
+        "role": user.role,
+    }
+
+
+def _to_hash(user: dict) -> dict:
+    """Flatten a cached user dict into Redis hash field values."""
+    mapping = {}
+    for field, value in user.items():
+        if isinstance(value, bool):
+            value = "1" if value else "0"
+        elif isinstance(value, Enum):
+            value = value.value
+        mapping[field] = "" if value is None else str(value)
+    return mapping
+
+
+def _from_hash(fields: dict) -> Optional[dict]:
+    """Rebuild a user dict from ``HGETALL`` output, or None if incomplete."""
+    user = {k.decode(): v.decode() for k, v in fields.items()}
+    # A hash written by a single-field update after expiry is not a full entry.
+    if not _REQUIRED_FIELDS.issubset(user):
+        return None
+    user["id"] = int(user["id"])
+    user["confirmed"] = user["confirmed"] == "1"
+    return user
+
 
 async def set_user_cache(user: dict) -> None:
-    """Store user dict in redis under `user:{username}` with TTL."""
+    """Store user dict in redis as a hash under `user:v2:{username}` with TTL."""
+    _local_users.pop(user["username"], None)
     r = get_redis()
-    key = f"user:{user['username']}"
+    key = _user_key(user["username"])
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping=_to_hash(user))
+        pipe.expire(key, config.CACHE_TTL)
+        await pipe.execute()
 
-    await r.set(key, json.dumps(user), ex=config.CACHE_TTL)
 
+async def set_user_cache_field(username: str, field: str, value) -> None:
+    """Update a single field of a cached user without rewriting the entry.
 
-async def get_user_cache(username: str) -> Optional[dict]:
-    """Return cached user dict or None."""
+    The existing TTL is kept; if the entry has already expired the partial
+    hash gets a fresh TTL and is ignored by :func:`get_user_cache`.
+    """
+    _local_users.pop(username, None)
     r = get_redis()
-    key = f"user:{username}"
-    val = await r.get(key)
-    if val is None:
+    key = _user_key(username)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hset(key, field, _to_hash({field: value})[field])
+        pipe.expire(key, config.CACHE_TTL, nx=True)
+        await pipe.execute()
+
+
+def get_local_user(username: str) -> Optional[dict]:
+    """Return a copy of the user from the process-local cache, without I/O."""
+    user = _local_users.get(username)
+    if user is None:
         return None
-    try:
-        return json.loads(val)
-    except Exception:
+    cache_stats["user_local_hit"] += 1
+    return dict(user)
+
+
+async def get_user_cache(username: str) -> Optional[dict]:
+    """Return cached user dict or None.
+
+    The process-local cache is consulted first; Redis hits are copied into it.
+    """
+    user = get_local_user(username)
+    if user is not None:
+        return user
+
+    r = get_redis()
+    fields = await r.hgetall(_user_key(username))
+    user = _from_hash(fields) if fields else None
+    if user is None:
+        cache_stats["user_miss"] += 1
         return None
+    cache_stats["user_redis_hit"] += 1
+    _local_users[username] = user
+    return dict(user)
 
 
 async def delete_user_cache(username: str) -> None:
+    _local_users.pop(username, None)
     r = get_redis()
-    key = f"user:{username}"
+    key = _user_key(username)
     await r.delete(key)
+
+
+async def set_user_session(user: dict, refresh_jti: str) -> None:
+    """Cache the user and record their refresh token id in one round trip.
+
+    Only the ``jti`` of the current refresh token is kept, in Redis under
+    ``refresh:{username}``; it expires together with the token itself.
+    """
+    r = get_redis()
+    username = user["username"]
+    _local_users.pop(username, None)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hset(_user_key(username), mapping=_to_hash(user))
+        pipe.expire(_user_key(username), config.CACHE_TTL)
+        pipe.set(
+            f"refresh:{username}",
+            refresh_jti,
+            ex=config.JWT_REFRESH_EXPIRATION_SECONDS,
+        )
+        await pipe.execute()
+
+
+async def get_refresh_jti(username: str) -> Optional[str]:
+    """Return the ``jti`` of the refresh token issued to ``username`` or None."""
+    r = get_redis()
+    val = await r.get(f"refresh:{username}")
+    return val.decode() if val is not None else None
+
+
+async def delete_user_session(username: str) -> None:
+    """Drop the cached user together with their refresh token."""
+    _local_users.pop(username, None)
+    r = get_redis()
+    await r.delete(_user_key(username), f"refresh:{username}")
@@ -15,15 +15,27 @@ except Exception:
 class Config:
 
     DB_URL = os.getenv("DB_URL")
+    # Connection pool per worker process (see src/database/db.py)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 20)
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or 10)
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE") or 1800)
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     # Use `or` to guard against empty-string environment values (e.g. on some platforms)
     CACHE_TTL = int(os.getenv("CACHE_TTL") or 86400)
+    CONTACTS_CACHE_TTL = int(os.getenv("CONTACTS_CACHE_TTL") or 60)
+    # Per-process user cache; bounds how long other workers serve a user
+    # changed elsewhere (e.g. after email confirmation or a password reset)
+    USER_LOCAL_CACHE_TTL = float(os.getenv("USER_LOCAL_CACHE_TTL") or 2)
     JWT_SECRET = os.getenv("JWT_SECRET", "your_jwt_secret_key")
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRATION_SECONDS = int(os.getenv("JWT_EXPIRATION_SECONDS") or 3600)
     JWT_REFRESH_EXPIRATION_SECONDS = int(
         os.getenv("JWT_REFRESH_EXPIRATION_SECONDS") or 604800
     )
+    # argon2id cost for new password hashes; raise on stronger hardware
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST") or 2)
+    ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST") or 65536)
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM") or 1)
 
     MAIL_USERNAME: EmailStr = "yurii.osadchiy@meta.ua"
     MAIL_PASSWORD: SecretStr = SecretStr("Mqwertyui86!")
@@ -35,8 +47,16 @@ class Config:
     MAIL_SSL_TLS: bool = True
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+    # Hand emails to the Redis queue consumed by `python -m src.services.mail_queue`
+    MAIL_QUEUE_ENABLED = os.getenv("MAIL_QUEUE_ENABLED", "false").lower() == "true"
 
-    ORIGINS = os.getenv("ORIGINS", "http://localhost:3000").split(",")
+    ORIGINS: tuple[str, ...] = tuple(
+        origin.strip()
+        for origin in os.getenv("ORIGINS", "http://localhost:3000").split(",")
+        if origin.strip()
+    )
+    # Interactive docs and the OpenAPI schema; disabled in the production image
+    DOCS_ENABLED = os.getenv("DOCS_ENABLED", "true").lower() == "true"
 
     CLOUDINARY_NAME = "dprywbm8e"
     CLOUDINARY_API_KEY = 459371715835687
@@ -44,6 +64,7 @@ class Config:
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = int(os.getenv("REDIS_PORT", 13130))
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS") or 50)
 
 
-config = Config
+config = Config()
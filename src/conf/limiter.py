@@ -1,11 +1,60 @@
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
-from starlette.responses import JSONResponse
+import time
+
 from fastapi import Request
+from starlette.responses import JSONResponse
+
+from src.cache.redis_client import get_redis
+
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimitExceeded(Exception):
+    """Raised by :func:`rate_limit` dependencies when a limit is hit."""
+
+
+def _parse_limit(limit: str) -> tuple[int, int]:
+    """Parse a ``"<times>/<period>"`` string into ``(times, seconds)``."""
+    times, period = limit.split("/")
+    return int(times), _PERIODS[period.strip()]
+
+
+def rate_limit(scope: str, *limits: str):
+    """Build a dependency enforcing fixed-window limits shared across workers.
+
+    Counters live in Redis, keyed by client address, ``scope`` and window,
+    and every window is incremented with ``INCR`` + ``EXPIRE`` in a single
+    pipeline, so all limits cost one round trip. If Redis is unavailable the
+    request is let through.
+
+    Args:
+        scope (str): Name that separates the counters of different routes.
+        *limits (str): Limits such as ``"5/minute"`` or ``"1/second"``.
+
+    Returns:
+        Callable: An async dependency raising :class:`RateLimitExceeded`.
+    """
+
+    parsed = [_parse_limit(limit) for limit in limits]
 
+    async def dependency(request: Request) -> None:
+        host = request.client.host if request.client else "127.0.0.1"
+        now = int(time.time())
+        try:
+            r = get_redis()
+            async with r.pipeline(transaction=False) as pipe:
+                for _, seconds in parsed:
+                    key = f"rl:{scope}:{host}:{seconds}:{now // seconds}"
+                    pipe.incr(key)
+                    pipe.expire(key, seconds)
+                results = await pipe.execute()
+        except Exception:
+            return
+        counts = results[::2]
+        if any(count > times for count, (times, _) in zip(counts, parsed)):
+            raise RateLimitExceeded()
 
-limiter = Limiter(key_func=get_remote_address)
+    return dependency
 
 
 def register_rate_limit_handler(app):
@@ -10,17 +10,60 @@ from sqlalchemy.ext.asyncio import (
 from src.conf.config import config
 
 
+def _engine_options(url: str) -> dict:
+    """Pool and driver settings for the application engine.
+
+    Connections are pinged before use; for PostgreSQL the pool is also sized
+    explicitly and connections are recycled periodically. SQLAlchemy's
+    compiled-SQL cache is enlarged so every hot statement stays compiled,
+    and for asyncpg the driver and SQLAlchemy prepared statement caches are
+    enlarged so repeated queries skip re-preparation.
+    """
+
+    options = {"pool_pre_ping": True, "query_cache_size": 1024}
+    if url.startswith("postgresql"):
+        # QueuePool sizing; SQLite engines use pools that reject these.
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_recycle=config.DB_POOL_RECYCLE,
+        )
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 256,
+        }
+    return options
+
+
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
-        self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+    def __init__(self, url: str | None):
+        # The engine is built on first use, so processes that import this
+        # module without querying (e.g. the mail worker) need no DB_URL.
+        self._url = url
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker | None = None
+
+    def _init_engine(self) -> None:
+        if not self._url:
+            raise Exception("Database URL is not configured")
+        self._engine = create_async_engine(self._url, **_engine_options(self._url))
+        # Objects returned by UPDATE/DELETE ... RETURNING are used after the
+        # commit, so they must not be expired (async sessions cannot lazy-load).
+        self._session_maker = async_sessionmaker(
+            autoflush=False, autocommit=False, expire_on_commit=False, bind=self._engine
         )
 
+    def pool_status(self) -> str:
+        """Return the connection pool's status line (size, checked out, overflow)."""
+        if self._engine is None:
+            self._init_engine()
+        return self._engine.pool.status()
+
     @contextlib.asynccontextmanager
     async def session(self):
         if self._session_maker is None:
-            raise Exception("Database session is not initialized")
+            self._init_engine()
         session = self._session_maker()
         try:
             yield session
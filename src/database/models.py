@@ -1,5 +1,20 @@
-from sqlalchemy import Date, ForeignKey, Integer, String, UniqueConstraint, func
-from sqlalchemy.orm import mapped_column, Mapped, DeclarativeBase, relationship
+from sqlalchemy import (
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.orm import (
+    mapped_column,
+    Mapped,
+    DeclarativeBase,
+    backref,
+    relationship,
+)
 from sqlalchemy.sql.sqltypes import DateTime
 from enum import Enum
 
@@ -20,6 +35,36 @@ class Contact(Base):
     __tablename__ = "contacts"
     __table_args__ = (
         UniqueConstraint("email", "phone", "user_id", name="uix_email_phone_userid"),
+        # Every query is scoped by owner; also serves id lookups per user.
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        # Serves get_upcoming_birthdays; must match repository.contacts.birth_mmdd
+        Index(
+            "ix_contacts_user_birth_mmdd",
+            "user_id",
+            text(
+                "(EXTRACT(month FROM birth_date) * 100"
+                " + EXTRACT(day FROM birth_date))"
+            ),
+        ).ddl_if(dialect="postgresql"),
+        # Trigram indexes let the ILIKE '%term%' searches in get_contacts use
+        # an index instead of scanning the table (requires pg_trgm).
+        *(
+            Index(
+                f"ix_contacts_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("name", "last_name", "email")
+        ),
+        # Left-anchored "starts with" searches on lower(column) (prefix=True)
+        *(
+            Index(
+                f"ix_contacts_{column}_lower",
+                text(f"lower({column}) text_pattern_ops"),
+            ).ddl_if(dialect="postgresql")
+            for column in ("name", "last_name", "email")
+        ),
     )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -31,7 +76,11 @@ class Contact(Base):
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, default=None
     )
-    user = relationship("User", backref="contacts")
+    # Async sessions cannot lazy-load, so relationships raise instead of
+    # silently issuing extra SELECTs; load them explicitly when needed.
+    user = relationship(
+        "User", backref=backref("contacts", lazy="raise"), lazy="raise"
+    )
 
 
 class User(Base):
@@ -46,4 +95,3 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(
         String(20), nullable=False, default=UserRole.USER
     )
-    refresh_token: Mapped[str] = mapped_column(String(255), nullable=True)
@@ -1,10 +1,78 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.orm import load_only
+from sqlalchemy import (
+    delete,
+    extract,
+    func,
+    insert,
+    literal_column,
+    select,
+    update,
+)
 from typing import Optional
 from src.database.models import Contact, User
 from src.schemas import ContactModel
-from datetime import date
-from typing import List, cast
+from datetime import date, timedelta
+from typing import List
+
+
+def birth_mmdd(column):
+    """Return ``month * 100 + day`` of a date column as a SQL expression.
+
+    The multiplier is rendered inline rather than bound so the expression
+    matches the ``ix_contacts_user_birth_mmdd`` index definition.
+    """
+
+    return (
+        extract("month", column) * literal_column("100")
+        + extract("day", column)
+    )
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search(column, term: str, prefix: bool):
+    """Build a case-insensitive match of ``term`` against ``column``.
+
+    Prefix matches compare ``lower(column)`` with a left-anchored pattern so
+    the ``ix_contacts_*_lower`` pattern-ops indexes give a range scan;
+    substring matches fall back to ``ILIKE '%term%'`` (trigram indexes).
+    ``%``, ``_`` and ``\\`` in ``term`` are escaped, so input such as ``%%%``
+    cannot turn into an expensive wildcard pattern.
+    """
+
+    term = _escape_like(term)
+    if prefix:
+        return func.lower(column).like(f"{term.lower()}%", escape="\\")
+    return column.ilike(f"%{term}%", escape="\\")
+
+
+def upcoming_mmdd(today: date, days: int) -> list[int]:
+    """List the ``MMDD`` values from ``today`` through ``today + days``.
+
+    The window wraps into the next year naturally. February 29 is included
+    whenever March 1 falls in the window of a non-leap year, so leap-day
+    birthdays are not skipped.
+
+    Args:
+        today (date): First day of the window.
+        days (int): Window length in days (inclusive), capped at one year.
+
+    Returns:
+        list[int]: Month/day values encoded as ``month * 100 + day``.
+    """
+
+    values = set()
+    for offset in range(min(max(days, 0), 365) + 1):
+        d = today + timedelta(days=offset)
+        values.add(d.month * 100 + d.day)
+    if 301 in values and 228 in values:
+        values.add(229)
+    return sorted(values)
 
 
 class ContactsRepository:
@@ -15,6 +83,8 @@ class ContactsRepository:
     on ``Contact.user_id == user.id``.
     """
 
+    __slots__ = ("db",)
+
     def __init__(self, session: AsyncSession):
         """Initialize the repository with an asynchronous DB session.
 
@@ -32,12 +102,14 @@ class ContactsRepository:
         name: Optional[str] = None,
         last_name: Optional[str] = None,
         email: Optional[str] = None,
+        prefix: bool = False,
     ) -> list[Contact]:
         """Retrieve a paginated list of contacts belonging to ``user``.
 
         Performs optional case-insensitive partial matching on ``name``,
         ``last_name`` and ``email`` and applies pagination using ``skip`` and
-        ``limit``.
+        ``limit``. With ``prefix`` the filters only match values that start
+        with the given terms, which is cheaper for large tables.
 
         Args:
             skip (int): Number of rows to skip (offset).
@@ -46,26 +118,72 @@ class ContactsRepository:
             name (Optional[str]): Substring to match against ``Contact.name``.
             last_name (Optional[str]): Substring to match against ``Contact.last_name``.
             email (Optional[str]): Substring to match against ``Contact.email``.
+            prefix (bool): Match terms as prefixes instead of substrings.
 
         Returns:
             list[Contact]: Contacts matching filters and pagination.
         """
 
-        stmt = select(Contact).filter_by(user_id=user.id)
+        stmt = self._filtered(select(Contact), user, name, last_name, email, prefix)
+        stmt = stmt.offset(skip).limit(limit)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
 
-        conditions = []
-        if name:
-            conditions.append(Contact.name.ilike(f"%{name}%"))
-        if last_name:
-            conditions.append(Contact.last_name.ilike(f"%{last_name}%"))
-        if email:
-            conditions.append(Contact.email.ilike(f"%{email}%"))
-        if conditions:
-            stmt = stmt.where(*conditions)
+    async def get_contacts_summary(
+        self,
+        skip: int,
+        limit: int,
+        user: User,
+        name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        email: Optional[str] = None,
+        prefix: bool = False,
+    ) -> list[Contact]:
+        """Like :meth:`get_contacts`, but load only the list-view columns.
 
+        Only ``id``, ``name``, ``last_name``, ``email`` and ``phone`` are
+        selected, which keeps ``additional_info`` and ``birth_date`` off the
+        wire for list views.
+
+        Args:
+            skip (int): Number of rows to skip (offset).
+            limit (int): Maximum number of rows to return.
+            user (User): Owner used to scope the query.
+            name (Optional[str]): Substring to match against ``Contact.name``.
+            last_name (Optional[str]): Substring to match against ``Contact.last_name``.
+            email (Optional[str]): Substring to match against ``Contact.email``.
+            prefix (bool): Match terms as prefixes instead of substrings.
+
+        Returns:
+            list[Contact]: Partially loaded contacts matching filters.
+        """
+
+        stmt = select(Contact).options(
+            load_only(
+                Contact.id,
+                Contact.name,
+                Contact.last_name,
+                Contact.email,
+                Contact.phone,
+            )
+        )
+        stmt = self._filtered(stmt, user, name, last_name, email, prefix)
         stmt = stmt.offset(skip).limit(limit)
         result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
+
+    @staticmethod
+    def _filtered(stmt, user: User, name, last_name, email, prefix: bool):
+        """Scope ``stmt`` to ``user`` and apply the optional search filters."""
+
+        conditions = [Contact.user_id == user.id]
+        if name:
+            conditions.append(_search(Contact.name, name, prefix))
+        if last_name:
+            conditions.append(_search(Contact.last_name, last_name, prefix))
+        if email:
+            conditions.append(_search(Contact.email, email, prefix))
+        return stmt.where(*conditions)
 
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact | None:
         """Retrieve a single contact by ``contact_id`` for ``user``.
@@ -78,8 +196,8 @@ class ContactsRepository:
             Contact | None: The contact if found and owned by ``user``, otherwise ``None``.
         """
 
-        stmt = (
-            select(Contact).filter_by(user_id=user.id).where(Contact.id == contact_id)
+        stmt = select(Contact).where(
+            Contact.user_id == user.id, Contact.id == contact_id
         )
         result = await self.db.execute(stmt)
         return result.scalars().one_or_none()
@@ -87,19 +205,25 @@ class ContactsRepository:
     async def create_contact(self, body: ContactModel, user: User) -> Contact:
         """Create a new contact and persist it to the database.
 
+        The row is written with ``INSERT ... RETURNING``, so no follow-up
+        ``SELECT`` is needed to populate generated columns.
+
         Args:
             body (ContactModel): Input model containing contact fields.
             user (User): Owner whose id will be assigned to the new contact.
 
         Returns:
-            Contact: The newly created and refreshed contact instance.
+            Contact: The newly created contact instance.
         """
 
-        contact = Contact(**body.model_dump())
-        contact.user_id = user.id
-        self.db.add(contact)
+        stmt = (
+            insert(Contact)
+            .values(**body.model_dump(), user_id=user.id)
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(contact)
         return contact
 
     async def update_contact(
@@ -107,6 +231,9 @@ class ContactsRepository:
     ) -> Contact | None:
         """Update fields of an existing contact owned by ``user``.
 
+        Runs a single ``UPDATE ... RETURNING`` scoped to the owner instead of
+        loading the row first.
+
         Args:
             contact_id (int): Primary key of the contact to update.
             body (ContactModel): Input model with fields to update.
@@ -117,18 +244,22 @@ class ContactsRepository:
             ``user``, otherwise ``None``.
         """
 
-        contact = await self.get_contact_by_id(contact_id, user)
-        if contact:
-            for key, value in body.model_dump().items():
-                setattr(contact, key, value)
-            self.db.add(contact)
-            await self.db.commit()
-            await self.db.refresh(contact)
+        stmt = (
+            update(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .values(**body.model_dump())
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        await self.db.commit()
         return contact
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact | None:
         """Delete a contact owned by ``user``.
 
+        Runs a single ``DELETE ... RETURNING`` scoped to the owner.
+
         Args:
             contact_id (int): Primary key of the contact to remove.
             user (User): Owner used to scope the deletion.
@@ -138,18 +269,23 @@ class ContactsRepository:
             ``user``, otherwise ``None``.
         """
 
-        contact = await self.get_contact_by_id(contact_id, user)
-        if contact:
-            await self.db.delete(contact)
-            await self.db.commit()
+        stmt = (
+            delete(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        await self.db.commit()
         return contact
 
     async def get_upcoming_birthdays(self, user: User, days: int = 7) -> List[Contact]:
         """Return contacts with birthdays within the next ``days`` days.
 
-        Only contacts with a non-null ``birth_date`` are considered. The check
-        compares month/day relative to today and will roll into the next year as
-        needed.
+        The month/day window is expanded in Python and matched in SQL against
+        ``birth_mmdd``, so only matching rows leave the database and the
+        ``ix_contacts_user_birth_mmdd`` expression index can be used. Contacts
+        without a ``birth_date`` never match.
 
         Args:
             user (User): Owner used to scope the query.
@@ -159,33 +295,9 @@ class ContactsRepository:
             List[Contact]: Contacts whose next birthday falls within ``days`` days.
         """
 
-        stmt = (
-            select(Contact)
-            .filter_by(user_id=user.id)
-            .where(Contact.birth_date.is_not(None))
+        stmt = select(Contact).where(
+            Contact.user_id == user.id,
+            birth_mmdd(Contact.birth_date).in_(upcoming_mmdd(date.today(), days)),
         )
         result = await self.db.execute(stmt)
-        contacts = list(result.scalars().all())
-
-        today = date.today()
-        upcoming: List[Contact] = []
-
-        def next_birthday(birth: date, today: date) -> date:
-            year = today.year
-            candidate = date(year, birth.month, birth.day)
-
-            if candidate < today:
-                year += 1
-
-            return candidate
-
-        for c in contacts:
-            if not c.birth_date:
-                continue
-
-            nb = next_birthday(cast(date, c.birth_date), today)
-            delta = (nb - today).days
-            if 0 <= delta <= days:
-                upcoming.append(c)
-
-        return upcoming
+        return result.scalars().all()
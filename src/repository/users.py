@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
@@ -63,6 +63,31 @@ class UserRepository:
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
+    async def get_user_by_email_or_username(
+        self, email: str, username: str
+    ) -> User | None:
+        """Fetch a user whose email or username matches, in one query.
+
+        When both match different users, the email match is returned so the
+        caller can report the email conflict first.
+
+        Args:
+            email (str): Email address to search for.
+            username (str): Username to search for.
+
+        Returns:
+            User | None: The matching user instance if found, otherwise ``None``.
+        """
+
+        stmt = (
+            select(User)
+            .where(or_(User.email == email, User.username == username))
+            .order_by((User.email == email).desc())
+            .limit(1)
+        )
+        user = await self.db.execute(stmt)
+        return user.scalar_one_or_none()
+
     async def create_user(self, body: UserCreate, avatar: str = "") -> User:
         """Create a new user record.
 
@@ -71,17 +96,21 @@ class UserRepository:
             avatar (str): Optional avatar URL to assign.
 
         Returns:
-            User: The newly created and refreshed user instance.
+            User: The newly created user, populated via ``INSERT ... RETURNING``.
         """
 
-        user = User(
-            **body.model_dump(exclude_unset=True, exclude={"password"}),
-            hashed_password=body.password,
-            avatar=avatar,
+        stmt = (
+            insert(User)
+            .values(
+                **body.model_dump(exclude_unset=True, exclude={"password"}),
+                hashed_password=body.password,
+                avatar=avatar,
+            )
+            .returning(User)
         )
-        self.db.add(user)
+        result = await self.db.execute(stmt)
+        user = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(user)
         return user
 
     async def confirmed_email(self, email: str) -> None:
@@ -142,3 +171,18 @@ class UserRepository:
         await self.db.commit()
         await self.db.refresh(user)
         return user
+
+    async def update_password_hash(self, user: User, hashed_password: str) -> User:
+        """Replace the stored hash of an already loaded user.
+
+        Args:
+            user (User): User instance loaded in this session.
+            hashed_password (str): New hashed password.
+
+        Returns:
+            User: The updated user instance.
+        """
+
+        user.hashed_password = hashed_password
+        await self.db.commit()
+        return user
@@ -4,6 +4,8 @@ from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
 
 from src.database.models import UserRole
 
+_MIN_BIRTH_DATE = date(1900, 1, 1)
+
 
 class ContactModel(BaseModel):
     name: str = Field(max_length=50)
@@ -13,14 +15,14 @@ class ContactModel(BaseModel):
     birth_date: Optional[date] = None
     additional_info: Optional[str] = Field(None, max_length=250)
 
-    @field_validator("birth_date")
+    @field_validator("birth_date", mode="after")
+    @classmethod
     def validate_birthdate(cls, v: Optional[date]):
         if v is None:
             return None
-        today = date.today()
-        if v > today:
+        if v > date.today():
             raise ValueError("birth_date cannot be in the future")
-        if v < date(1900, 1, 1):
+        if v < _MIN_BIRTH_DATE:
             raise ValueError("birth_date is too far in the past")
         return v
 
@@ -31,11 +33,21 @@ class ContactResponseModel(ContactModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ContactSummaryModel(BaseModel):
+    id: int
+    name: str
+    last_name: str
+    email: str
+    phone: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class User(BaseModel):
     id: int
     username: str
     email: str
-    avatar: str
+    avatar: Optional[str] = None
     confirmed: bool = False
     role: UserRole
 
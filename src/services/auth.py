@@ -1,30 +1,115 @@
 from datetime import datetime, timedelta, UTC
 from typing import Optional, Literal, Union
-
-from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+import uuid
+
+import anyio
+import anyio.to_thread
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from cachetools import TTLCache
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from jose import JWTError, jwt
+import jwt
 
+from src.cache.metrics import cache_stats
 from src.database.db import get_db
 from src.conf.config import config
 from src.services.users import UserService
-from src.cache.user_cache import get_user_cache
+from src.cache.user_cache import (
+    get_local_user,
+    get_refresh_jti,
+    get_user_cache,
+    set_user_cache,
+    user_to_cache,
+)
 from src.schemas import User as UserSchema
 from src.database.models import User, UserRole
 
 
-class Hash:
-    """Password hashing utilities using :class:`passlib.context.CryptContext`.
+# Each hash is its own thread job, so concurrent logins hash in parallel.
+# The limiter caps how many run at once (argon2 holds ARGON2_MEMORY_COST KiB
+# per hash) below the thread pool's own 40-thread default.
+_hash_limiter = anyio.CapacityLimiter(os.cpu_count() or 1)
+
+
+async def _run_hash(fn, *args):
+    """Run a blocking hash function on a worker thread and return its result."""
+    return await anyio.to_thread.run_sync(fn, *args, limiter=_hash_limiter)
 
-    Methods are thin wrappers around the configured ``pwd_context``.
+
+class Hash:
+    """Password hashing utilities backed by argon2id and bcrypt.
+
+    New hashes use argon2id with the cost taken from ``ARGON2_*`` settings.
+    Existing bcrypt hashes still verify, and :meth:`needs_rehash` reports
+    them so they can be upgraded after a successful login. bcrypt only uses
+    the first 72 bytes of a password, so those inputs are truncated
+    explicitly (matching the previous passlib behaviour). The public
+    methods are coroutines: the hashing work runs on a worker thread, so it
+    never blocks the event loop.
     """
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    _argon2 = PasswordHasher(
+        time_cost=config.ARGON2_TIME_COST,
+        memory_cost=config.ARGON2_MEMORY_COST,
+        parallelism=config.ARGON2_PARALLELISM,
+    )
+
+    @staticmethod
+    def _encode(password: str) -> bytes:
+        return password.encode("utf-8")[:72]
+
+    @staticmethod
+    def _is_argon2(hashed_password: str) -> bool:
+        return hashed_password.startswith("$argon2")
+
+    def _checkpw(self, plain_password: str, hashed_password: str) -> bool:
+        if self._is_argon2(hashed_password):
+            try:
+                return self._argon2.verify(hashed_password, plain_password)
+            except (VerificationError, InvalidHashError):
+                return False
+        try:
+            return bcrypt.checkpw(
+                self._encode(plain_password), hashed_password.encode("utf-8")
+            )
+        except ValueError:
+            # Not a bcrypt hash
+            return False
+
+    def _hashpw(self, password: str) -> str:
+        return self._argon2.hash(password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Return True if ``hashed_password`` should be replaced.
+
+        bcrypt hashes and argon2 hashes made with other parameters than the
+        configured ones are reported.
+
+        Args:
+            hashed_password (str): The stored password hash.
 
-    def verify_password(self, plain_password, hashed_password):
+        Returns:
+            bool: True if the hash should be recomputed.
+        """
+
+        if not self._is_argon2(hashed_password):
+            return True
+        try:
+            return self._argon2.check_needs_rehash(hashed_password)
+        except InvalidHashError:
+            return True
+
+    async def verify_password(self, plain_password, hashed_password):
         """Verify a plain password against a stored hash.
 
         Args:
@@ -35,10 +120,10 @@ class Hash:
             bool: True if the password matches, False otherwise.
         """
 
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return await _run_hash(self._checkpw, plain_password, hashed_password)
 
-    def get_password_hash(self, password: str):
-        """Hash the provided password using the configured algorithms.
+    async def get_password_hash(self, password: str):
+        """Hash the provided password with argon2id and a fresh salt.
 
         Args:
             password (str): Plaintext password.
@@ -47,11 +132,75 @@ class Hash:
             str: Hashed password.
         """
 
-        return self.pwd_context.hash(password)
+        return await _run_hash(self._hashpw, password)
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Token settings are fixed for the life of the process, so resolve them once.
+_JWT_SECRET = config.JWT_SECRET
+_JWT_ALG = config.JWT_ALGORITHM
+# Parse the key once: raw bytes for HMAC, a key object for RSA/EC (whose
+# PEM would otherwise be parsed on every call). Asymmetric tokens are
+# verified with the matching public key.
+_SIGNING_KEY = jwt.get_algorithm_by_name(_JWT_ALG).prepare_key(_JWT_SECRET)
+_VERIFY_KEY = (
+    _SIGNING_KEY.public_key() if hasattr(_SIGNING_KEY, "public_key") else _SIGNING_KEY
+)
+_ACCESS_TD = timedelta(seconds=config.JWT_EXPIRATION_SECONDS)
+_REFRESH_TD = timedelta(seconds=config.JWT_REFRESH_EXPIRATION_SECONDS)
+_EMAIL_TD = timedelta(days=7)
+
+# Recently verified token claims keyed by a digest of the token. The digest
+# only serves as a lookup key; tokens missing here are fully verified.
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+
+def _decode_token(token: str) -> dict:
+    """Decode and verify a JWT, reusing recently verified claims.
+
+    Verified payloads are kept for up to 30 seconds, but never past the
+    token's own ``exp`` claim, so repeated calls with the same token skip
+    the signature check. Used for access, refresh and email tokens; callers
+    still check the token type claims themselves.
+
+    Args:
+        token (str): Encoded JWT.
+
+    Returns:
+        dict: The verified token claims.
+
+    Raises:
+        jwt.PyJWTError: If the token cannot be decoded or verified.
+    """
+
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _jwt_cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        cache_stats["jwt_hit"] += 1
+        return cached[0]
+
+    cache_stats["jwt_miss"] += 1
+    payload = jwt.decode(token, _VERIFY_KEY, algorithms=[_JWT_ALG])
+    _jwt_cache[key] = (payload, payload.get("exp", 0))
+    return payload
+
+
+def access_token_claims(user) -> dict:
+    """Return the identity claims embedded in access and refresh tokens.
+
+    Besides the ``sub`` username the tokens carry the user id (``uid``) and
+    role, so callers that only need identity can read them from the claims.
+
+    Args:
+        user: User model instance.
+
+    Returns:
+        dict: Claims to pass as ``data`` to the token creators.
+    """
+
+    return {"sub": user.username, "uid": user.id, "role": UserRole(user.role).value}
+
 
 def create_token(
     data: dict, expires_delta: timedelta, token_type: Literal["access", "refresh"]
@@ -76,20 +225,19 @@ def create_token(
     now = datetime.now(UTC)
     expire = now + expires_delta
     to_encode.update({"exp": expire, "iat": now, "token_type": token_type})
-    encoded_jwt = jwt.encode(
-        to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM
-    )
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=_JWT_ALG)
     return encoded_jwt
 
 
-async def create_access_token(
+def create_access_token(
     data: dict, expires_delta: Optional[Union[float, timedelta]] = None
 ):
     """Create an access JWT for short-lived authentication.
 
     The function accepts either a :class:`timedelta` or a numeric seconds
     value for ``expires_delta``. If none is provided, the default
-    lifetime from configuration is used.
+    lifetime from configuration is used. Token creation does no I/O, so
+    this is a plain function.
 
     Args:
         data (dict): Payload to include in the token (should contain ``sub``).
@@ -99,25 +247,28 @@ async def create_access_token(
     Returns:
         str: Encoded access token JWT.
     """
+    if expires_delta is None:
+        return create_token(data, _ACCESS_TD, "access")
     if isinstance(expires_delta, timedelta):
-        access_token = create_token(data, expires_delta, "access")
-    elif expires_delta:
-        access_token = create_token(data, timedelta(seconds=expires_delta), "access")
-    else:
-        access_token = create_token(
-            data, timedelta(seconds=config.JWT_EXPIRATION_SECONDS), "access"
-        )
-    return access_token
+        return create_token(data, expires_delta, "access")
+    return create_token(data, timedelta(seconds=expires_delta), "access")
+
+
+def new_refresh_jti() -> str:
+    """Return a fresh random id for a refresh token's ``jti`` claim."""
+
+    return uuid.uuid4().hex
 
 
-async def create_refresh_token(
+def create_refresh_token(
     data: dict, expires_delta: Optional[Union[float, timedelta]] = None
 ):
     """Create a refresh JWT used to obtain new access tokens.
 
     Accepts the same ``expires_delta`` semantics as :func:`create_access_token`.
     Refresh tokens are typically longer-lived and are marked with a
-    ``token_type`` claim of ``refresh``.
+    ``token_type`` claim of ``refresh``. A random ``jti`` claim is added
+    unless ``data`` already carries one.
 
     Args:
         data (dict): Payload to include in the token (should contain ``sub``).
@@ -127,93 +278,217 @@ async def create_refresh_token(
     Returns:
         str: Encoded refresh token JWT.
     """
+    if "jti" not in data:
+        data = {**data, "jti": new_refresh_jti()}
+    if expires_delta is None:
+        return create_token(data, _REFRESH_TD, "refresh")
     if isinstance(expires_delta, timedelta):
-        refresh_token = create_token(data, expires_delta, "refresh")
-    elif expires_delta:
-        refresh_token = create_token(data, timedelta(seconds=expires_delta), "refresh")
-    else:
-        refresh_token = create_token(
-            data, timedelta(seconds=config.JWT_REFRESH_EXPIRATION_SECONDS), "refresh"
-        )
-    return refresh_token
+        return create_token(data, expires_delta, "refresh")
+    return create_token(data, timedelta(seconds=expires_delta), "refresh")
 
 
 async def verify_refresh_token(refresh_token: str, db: AsyncSession):
     """Verify a refresh JWT and return the corresponding user.
 
     Decode and validate the provided refresh token, ensure the token is
-    marked with a ``token_type`` of ``refresh``, then look up and return the
-    database `User` whose ``username`` matches the token ``sub`` claim and
-    whose stored ``refresh_token`` equals the provided token.
+    marked with a ``token_type`` of ``refresh`` and that its ``jti`` is the
+    one currently stored in Redis for the token's ``sub``, then resolve that
+    user through :func:`get_cached_user`, so the database is only queried
+    when the user is not cached.
 
     Args:
         refresh_token (str): The encoded refresh JWT provided by the client.
         db (AsyncSession): Asynchronous database session for querying users.
 
     Returns:
-        Optional[User]: The matched `User` instance when the token is valid
+        Optional[UserSchema]: The matched user when the token is valid
             and matches the stored refresh token; otherwise ``None``.
 
     Notes:
-        JWT decoding errors are caught and the function returns ``None``
-        instead of raising an exception.
+        JWT decoding and Redis errors are caught and the function returns
+        ``None`` instead of raising an exception.
     """
     try:
-        payload = jwt.decode(
-            refresh_token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
-        username: Optional[str] = payload.get("sub")
-        token_type: Optional[str] = payload.get("token_type")
-        if username is None or token_type != "refresh":
-            return None
-        user = await db.execute(
-            select(User).filter(
-                User.username == username, User.refresh_token == refresh_token
-            )
-        )
-        return user.scalars().first()
-    except JWTError:
+        payload = _decode_token(refresh_token)
+    except jwt.PyJWTError:
+        return None
+    username: Optional[str] = payload.get("sub")
+    token_type: Optional[str] = payload.get("token_type")
+    jti: Optional[str] = payload.get("jti")
+    if username is None or token_type != "refresh" or not isinstance(jti, str):
         return None
+    try:
+        stored_jti = await get_refresh_jti(username)
+    except Exception:
+        return None
+    # The signature already proves the token is ours; the jti ties it to
+    # the most recent login.
+    if stored_jti is None or not hmac.compare_digest(stored_jti, jti):
+        return None
+    cached = await get_cached_user(username, db)
+    if cached is None:
+        return None
+    return _user_schema(cached)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_jwt_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """Verify the bearer token and return its claims without loading the user.
+
+    Raises a 401 HTTPException if decoding fails, the ``sub`` claim is
+    missing or the token is not an access token. Refresh tokens carry the
+    same claims but must only be accepted by the refresh endpoint.
+    """
+
+    try:
+        payload = _decode_token(token)
+    except jwt.PyJWTError:
+        raise _credentials_exception()
+    if payload.get("sub") is None or payload.get("token_type") != "access":
+        raise _credentials_exception()
+    return payload
+
+
+# How long a Redis user lookup may take before the database lookup is
+# started alongside it. ``user_cache_slow`` counts how often this fires.
+_USER_CACHE_BUDGET = 0.005
+
+
+async def _get_user_cache_safe(username: str) -> Optional[dict]:
+    try:
+        return await get_user_cache(username)
+    except Exception:
+        return None
+
+
+async def get_cached_user(username: str, db: AsyncSession) -> Optional[dict]:
+    """Return the cached user dict, loading it from the database on a miss.
+
+    Lookups go through the per-process cache and then Redis (see
+    :func:`src.cache.user_cache.get_user_cache`). If Redis has not answered
+    within ``_USER_CACHE_BUDGET`` seconds, the database query is started
+    speculatively so a slow cache miss does not serialize both round trips.
+    On a miss the user is written back to Redis for subsequent requests.
+    Redis errors are ignored.
+
+    Args:
+        username (str): Username to resolve.
+        db (AsyncSession): Database session used on a cache miss.
+
+    Returns:
+        Optional[dict]: Cached user payload, or ``None`` if no such user.
+    """
+
+    cached = get_local_user(username)
+    if cached is not None:
+        return cached
+
+    user_service = UserService(db)
+    cache_task = asyncio.create_task(_get_user_cache_safe(username))
+    done, _ = await asyncio.wait({cache_task}, timeout=_USER_CACHE_BUDGET)
+    if done:
+        cached = cache_task.result()
+        if cached is not None:
+            return cached
+        user = await user_service.get_user_by_username(username)
+    else:
+        cache_stats["user_cache_slow"] += 1
+        db_task = asyncio.create_task(user_service.get_user_by_username(username))
+        await asyncio.wait({cache_task, db_task}, return_when=asyncio.FIRST_COMPLETED)
+        if cache_task.done():
+            cached = cache_task.result()
+        else:
+            cache_task.cancel()
+        # The session is shared with the rest of the request, so the query
+        # is always awaited rather than cancelled, even on a cache hit.
+        user = await db_task
+        if cached is not None:
+            return cached
+
+    if user is None:
+        return None
+
+    cached = user_to_cache(user)
+    try:
+        await set_user_cache(cached)
+    except Exception:
+        pass
+    return cached
+
+
+# Validated schemas for recently seen users, stored with the cached dict they
+# were built from. A schema is reused only while that dict is unchanged, and
+# each caller gets its own copy so requests never share a mutable model.
+_user_schemas: TTLCache = TTLCache(
+    maxsize=10_000, ttl=config.USER_LOCAL_CACHE_TTL
+)
+
+
+def _user_schema(cached: dict) -> UserSchema:
+    """Return a validated :class:`UserSchema` for ``cached``, reusing prior work."""
+
+    username = cached["username"]
+    entry = _user_schemas.get(username)
+    if entry is not None and entry[0] == cached:
+        return entry[1].model_copy()
+    schema = UserSchema.model_validate(cached)
+    _user_schemas[username] = (dict(cached), schema)
+    return schema.model_copy()
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+    request: Request,
+    claims: dict = Depends(get_jwt_claims),
+    db: AsyncSession = Depends(get_db),
 ):
     """Resolve the currently authenticated user from a bearer token.
 
-    This dependency decodes the JWT, extracts the ``sub`` claim as the
-    username and loads the corresponding user from the database.
+    This dependency takes the verified ``sub`` claim as the username and
+    resolves the user through :func:`get_cached_user`, so the database is
+    only queried on a cache miss. The result is memoized on
+    ``request.state`` so it is built at most once per request.
 
     Raises a 401 HTTPException if decoding fails or the user is not found.
     """
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
 
-    try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
-        username = payload["sub"]
-        if username is None:
-            raise credentials_exception
-    except JWTError as e:
-        raise credentials_exception
+    cached = await get_cached_user(claims["sub"], db)
+    if cached is None:
+        raise _credentials_exception()
+    current_user = _user_schema(cached)
+    request.state.current_user = current_user
+    return current_user
 
-    cached = await get_user_cache(username)
 
-    if cached is not None:
+async def get_current_user_id(
+    request: Request,
+    claims: dict = Depends(get_jwt_claims),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Build the authenticated user from the access-token claims alone.
 
-        return UserSchema.model_validate(cached)
+    Access tokens carry the user's ``uid`` and ``role`` next to ``sub``, and
+    their signature has already been verified, so endpoints that only need
+    ``user.id`` to scope queries can skip the cache and database lookup.
+    The returned :class:`User` is transient and holds only ``id``,
+    ``username`` and ``role``. Tokens issued before ``uid`` was added fall
+    back to :func:`get_current_user`.
+    """
 
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
-    if user is None:
-        raise credentials_exception
-    return user
+    uid = claims.get("uid")
+    if uid is None:
+        return await get_current_user(request, claims, db)
+    return User(id=uid, username=claims["sub"], role=claims.get("role"))
 
 
 def create_email_token(data: dict):
@@ -227,13 +502,13 @@ def create_email_token(data: dict):
     """
 
     to_encode = data.copy()
-    expire = datetime.now(UTC) + timedelta(days=7)
-    to_encode.update({"iat": datetime.now(UTC), "exp": expire})
-    token = jwt.encode(to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
+    now = datetime.now(UTC)
+    to_encode.update({"iat": now, "exp": now + _EMAIL_TD})
+    token = jwt.encode(to_encode, _SIGNING_KEY, algorithm=_JWT_ALG)
     return token
 
 
-async def get_email_from_token(token: str):
+def get_email_from_token(token: str):
     """Decode an email verification token and return the email.
 
     Args:
@@ -247,18 +522,21 @@ async def get_email_from_token(token: str):
     """
 
     try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
+        payload = _decode_token(token)
         email = payload["sub"]
         return email
-    except JWTError as e:
+    except jwt.PyJWTError as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Invalid token for email verification",
         )
 
 
+# Audience of password-reset tokens. Decoding without ``audience`` rejects
+# tokens that carry one, so these cannot pass as any other token type.
+_PWD_RESET_AUDIENCE = "pwd_reset"
+
+
 def create_password_reset_token(data: dict, expires_seconds: int = 3600):
     """Create a short-lived JWT for password reset.
 
@@ -271,26 +549,31 @@ def create_password_reset_token(data: dict, expires_seconds: int = 3600):
     """
 
     to_encode = data.copy()
-    expire = datetime.now(UTC) + timedelta(seconds=expires_seconds)
-    to_encode.update({"iat": datetime.now(UTC), "exp": expire, "purpose": "pwd_reset"})
-    token = jwt.encode(to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
+    now = datetime.now(UTC)
+    to_encode.update(
+        {
+            "iat": now,
+            "exp": now + timedelta(seconds=expires_seconds),
+            "aud": _PWD_RESET_AUDIENCE,
+        }
+    )
+    token = jwt.encode(to_encode, _SIGNING_KEY, algorithm=_JWT_ALG)
     return token
 
 
-async def get_email_from_password_reset_token(token: str):
+def get_email_from_password_reset_token(token: str):
     """Decode a password-reset token and return the email.
 
-    Raises HTTPException on invalid/expired tokens or wrong purpose.
+    Raises HTTPException on invalid/expired tokens or a missing or wrong
+    ``aud`` claim.
     """
     try:
         payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
+            token, _VERIFY_KEY, algorithms=[_JWT_ALG], audience=_PWD_RESET_AUDIENCE
         )
-        if payload.get("purpose") != "pwd_reset":
-            raise JWTError("Invalid token purpose")
         email = payload["sub"]
         return email
-    except JWTError:
+    except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Invalid or expired password reset token",
@@ -1,12 +1,38 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from src.cache.contacts_cache import (
+    contacts_list_key,
+    get_contacts_cache,
+    invalidate_contacts_cache,
+    set_contacts_cache,
+)
 from src.database.models import Contact, User
 from src.repository.contacts import ContactsRepository
-from src.schemas import ContactModel
+from src.schemas import ContactModel, ContactResponseModel, ContactSummaryModel
 from sqlalchemy.exc import IntegrityError
 
 
+_CONTACT_UNIQUE_CONSTRAINT = "uix_email_phone_userid"
+
+
+def _constraint_name(e: IntegrityError) -> str | None:
+    """Return the violated constraint name reported by the DB driver.
+
+    SQLAlchemy's asyncpg adapter chains the driver exception, which exposes
+    ``constraint_name``; psycopg exposes it on ``diag``. Returns ``None``
+    when the driver does not report one (e.g. SQLite).
+    """
+
+    for err in (e.orig, getattr(e.orig, "__cause__", None)):
+        name = getattr(err, "constraint_name", None)
+        if name is None:
+            name = getattr(getattr(err, "diag", None), "constraint_name", None)
+        if name is not None:
+            return name
+    return None
+
+
 def _handle_integrity_error(e: IntegrityError):
     """Map SQLAlchemy IntegrityError to a FastAPI HTTPException.
 
@@ -18,7 +44,12 @@ def _handle_integrity_error(e: IntegrityError):
             otherwise 400 for general integrity errors.
     """
 
-    if "uix_email_phone_userid" in str(e.orig):
+    name = _constraint_name(e)
+    if name is None:
+        duplicate = _CONTACT_UNIQUE_CONSTRAINT in str(e.orig)
+    else:
+        duplicate = name == _CONTACT_UNIQUE_CONSTRAINT
+    if duplicate:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A contact with this email or phone already exists.",
@@ -33,10 +64,13 @@ def _handle_integrity_error(e: IntegrityError):
 class ContactsService:
     """Service layer for contact-related business logic.
 
-    The service wraps :class:`ContactsRepository` and translates DB-level
-    integrity errors into HTTP exceptions.
+    The service wraps :class:`ContactsRepository`, translates DB-level
+    integrity errors into HTTP exceptions and keeps the Redis cache of
+    contact list pages in sync with writes.
     """
 
+    __slots__ = ("contacts_repo",)
+
     def __init__(self, db: AsyncSession):
         """Initialize the contacts service with a DB session.
 
@@ -54,9 +88,13 @@ class ContactsService:
         name: str | None = None,
         last_name: str | None = None,
         email: str | None = None,
-    ) -> list[Contact]:
+        prefix: bool = False,
+    ) -> list[dict]:
         """Return a paginated list of user's contacts.
 
+        Pages are served from Redis when cached; otherwise they are loaded
+        from the database and cached for ``CONTACTS_CACHE_TTL`` seconds.
+
         Args:
             user (User): Owner to scope the query.
             skip (int): Offset for pagination.
@@ -64,20 +102,89 @@ class ContactsService:
             name (str | None): Optional name filter.
             last_name (str | None): Optional last name filter.
             email (str | None): Optional email filter.
+            prefix (bool): Match filters as prefixes instead of substrings.
 
         Returns:
-            list[Contact]: Contacts matching filters.
+            list[dict]: Serialized contacts matching filters.
         """
 
-        return await self.contacts_repo.get_contacts(
-            skip,
-            limit,
+        key = contacts_list_key(user.id, skip, limit, name, last_name, email, prefix)
+        return await self._cached_page(
             user,
-            name,
-            last_name,
-            email,
+            key,
+            ContactResponseModel,
+            lambda: self.contacts_repo.get_contacts(
+                skip, limit, user, name, last_name, email, prefix
+            ),
         )
 
+    async def get_contacts_summary(
+        self,
+        user: User,
+        skip: int = 0,
+        limit: int = 100,
+        name: str | None = None,
+        last_name: str | None = None,
+        email: str | None = None,
+        prefix: bool = False,
+    ) -> list[dict]:
+        """Return a paginated list of user's contacts with list-view fields only.
+
+        Cached the same way as :meth:`get_contacts`, under a separate key.
+
+        Args:
+            user (User): Owner to scope the query.
+            skip (int): Offset for pagination.
+            limit (int): Maximum number of results.
+            name (str | None): Optional name filter.
+            last_name (str | None): Optional last name filter.
+            email (str | None): Optional email filter.
+            prefix (bool): Match filters as prefixes instead of substrings.
+
+        Returns:
+            list[dict]: Serialized contact summaries matching filters.
+        """
+
+        key = contacts_list_key(
+            user.id, skip, limit, name, last_name, email, prefix, view="summary"
+        )
+        return await self._cached_page(
+            user,
+            key,
+            ContactSummaryModel,
+            lambda: self.contacts_repo.get_contacts_summary(
+                skip, limit, user, name, last_name, email, prefix
+            ),
+        )
+
+    async def _cached_page(self, user: User, key: str, model, load) -> list[dict]:
+        """Serve a list page from Redis, or call ``load`` and cache the result.
+
+        Args:
+            user (User): Owner of the cached page.
+            key (str): Cache key built by ``contacts_list_key``.
+            model: Pydantic model used to serialize each row.
+            load: Coroutine function returning the rows on a cache miss.
+
+        Returns:
+            list[dict]: Serialized rows.
+        """
+
+        try:
+            cached = await get_contacts_cache(key)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached
+
+        contacts = await load()
+        payload = [model.model_validate(c).model_dump(mode="json") for c in contacts]
+        try:
+            await set_contacts_cache(user.id, key, payload)
+        except Exception:
+            pass
+        return payload
+
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact | None:
         """Fetch a contact by id scoped to ``user``.
 
@@ -93,19 +200,24 @@ class ContactsService:
 
     async def create_contact(self, body: ContactModel, user: User) -> Contact | None:
         try:
-            return await self.contacts_repo.create_contact(body, user)
+            contact = await self.contacts_repo.create_contact(body, user)
         except IntegrityError as e:
             await self.contacts_repo.db.rollback()
             _handle_integrity_error(e)
+        await self._invalidate_cache(user)
+        return contact
 
     async def update_contact(
         self, contact_id: int, body: ContactModel, user: User
     ) -> Contact | None:
         try:
-            return await self.contacts_repo.update_contact(contact_id, body, user)
+            contact = await self.contacts_repo.update_contact(contact_id, body, user)
         except IntegrityError as e:
             await self.contacts_repo.db.rollback()
             _handle_integrity_error(e)
+        if contact is not None:
+            await self._invalidate_cache(user)
+        return contact
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact | None:
         """Remove a contact owned by ``user``.
@@ -118,7 +230,10 @@ class ContactsService:
             Contact | None: The deleted contact if it existed, otherwise ``None``.
         """
 
-        return await self.contacts_repo.remove_contact(contact_id, user)
+        contact = await self.contacts_repo.remove_contact(contact_id, user)
+        if contact is not None:
+            await self._invalidate_cache(user)
+        return contact
 
     async def get_upcoming_birthdays(self, user: User, days: int = 7) -> list[Contact]:
         """Return contacts with upcoming birthdays for ``user`` within ``days``.
@@ -132,3 +247,11 @@ class ContactsService:
         """
 
         return await self.contacts_repo.get_upcoming_birthdays(user, days)
+
+    async def _invalidate_cache(self, user: User) -> None:
+        """Drop cached contact list pages of ``user`` after a write."""
+
+        try:
+            await invalidate_contacts_cache(user.id)
+        except Exception:
+            pass
@@ -11,6 +11,8 @@ from src.conf.config import config
 
 os.environ.setdefault("SSL_CERT_FILE", certifi.where())
 
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
 conf = ConnectionConfig(
     MAIL_USERNAME=config.MAIL_USERNAME,
     MAIL_PASSWORD=config.MAIL_PASSWORD,
@@ -22,9 +24,11 @@ conf = ConnectionConfig(
     MAIL_SSL_TLS=config.MAIL_SSL_TLS,
     USE_CREDENTIALS=config.USE_CREDENTIALS,
     VALIDATE_CERTS=config.VALIDATE_CERTS,
-    TEMPLATE_FOLDER=Path(__file__).parent / "templates",
+    TEMPLATE_FOLDER=TEMPLATE_DIR,
 )
 
+fm = FastMail(conf)
+
 
 async def send_email(email: str, username: str, host: str):
     """Send a verification email to a user.
@@ -35,7 +39,7 @@ async def send_email(email: str, username: str, host: str):
         host (str): Hostname used to build verification links.
 
     Notes:
-        This function uses the global ``conf`` :class:`ConnectionConfig` and
+        This function uses the module-level :class:`FastMail` client and
         renders the ``verify_email.html`` template.
     """
 
@@ -52,7 +56,6 @@ async def send_email(email: str, username: str, host: str):
             subtype=MessageType.html,
         )
 
-        fm = FastMail(conf)
         await fm.send_message(message, template_name="verify_email.html")
     except ConnectionErrors as err:
         print(err)
@@ -77,7 +80,6 @@ async def send_password_reset_email(email: str, username: str, host: str):
             subtype=MessageType.html,
         )
 
-        fm = FastMail(conf)
         await fm.send_message(message, template_name="password_reset.html")
     except ConnectionErrors as err:
         print(err)
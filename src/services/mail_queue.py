@@ -0,0 +1,115 @@
+"""Out-of-process delivery of transactional emails.
+
+When ``MAIL_QUEUE_ENABLED`` is set, API handlers push email jobs onto a
+Redis list and return immediately; a separate worker process started with
+``python -m src.services.mail_queue`` pops the jobs and talks to SMTP. When
+the queue is disabled or Redis is unavailable, the email is sent from the
+API process via FastAPI background tasks as before.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+import orjson
+from fastapi import BackgroundTasks
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from src.cache.redis_client import close_redis, get_redis
+from src.conf.config import config
+from src.services.mail import send_email, send_password_reset_email
+
+logger = logging.getLogger(__name__)
+
+MAIL_QUEUE_KEY = "mail:queue"
+
+MailSender = Callable[[str, str, str], Awaitable[None]]
+
+_SENDERS = {
+    sender.__name__: sender for sender in (send_email, send_password_reset_email)
+}
+
+
+async def enqueue_email(
+    background_tasks: BackgroundTasks,
+    sender: MailSender,
+    email: str,
+    username: str,
+    host: str,
+) -> None:
+    """Schedule an email for delivery outside the request.
+
+    Args:
+        background_tasks (BackgroundTasks): Fallback task runner.
+        sender (MailSender): One of the senders in :mod:`src.services.mail`.
+        email (str): Recipient email address.
+        username (str): Recipient username for the email template.
+        host (str): Hostname used to build links in the email.
+    """
+
+    if config.MAIL_QUEUE_ENABLED:
+        job = {
+            "task": sender.__name__,
+            "email": email,
+            "username": username,
+            "host": host,
+        }
+        try:
+            await get_redis().rpush(MAIL_QUEUE_KEY, orjson.dumps(job))
+            return
+        except Exception:
+            pass
+    background_tasks.add_task(sender, email, username, host)
+
+
+async def process_job(raw: bytes) -> None:
+    """Decode a queued job and send the email it describes.
+
+    Args:
+        raw (bytes): JSON payload popped from :data:`MAIL_QUEUE_KEY`.
+    """
+
+    try:
+        job = orjson.loads(raw)
+        sender: Optional[MailSender] = _SENDERS.get(job["task"])
+        if sender is None:
+            raise KeyError(job["task"])
+        await sender(job["email"], job["username"], job["host"])
+    except Exception:
+        logger.exception("Dropping mail job %r", raw)
+
+
+# Delay before retrying BLPOP after a Redis error, doubled up to the maximum.
+_RETRY_DELAY = 1.0
+_MAX_RETRY_DELAY = 30.0
+
+
+async def run_worker() -> None:
+    """Consume :data:`MAIL_QUEUE_KEY` with ``BLPOP`` until cancelled.
+
+    Redis connection and timeout errors are logged and retried with
+    exponential backoff; the pool reconnects on the next command.
+    """
+
+    r = get_redis()
+    delay = _RETRY_DELAY
+    try:
+        while True:
+            try:
+                item = await r.blpop([MAIL_QUEUE_KEY], timeout=5)
+            except (RedisConnectionError, RedisTimeoutError):
+                logger.exception("Redis unavailable, retrying in %.0fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_RETRY_DELAY)
+                continue
+            delay = _RETRY_DELAY
+            if item is not None:
+                await process_job(item[1])
+    finally:
+        await close_redis()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
@@ -1,12 +1,14 @@
 import cloudinary
 import cloudinary.uploader
+from fastapi.concurrency import run_in_threadpool
 
 
 class UploadFileService:
     """Upload files to Cloudinary and return a resized image URL.
 
     The class configures the global Cloudinary client on initialization and
-    exposes a static helper to upload a file and return a small avatar URL.
+    exposes an async helper to upload a file and return a small avatar URL.
+    Create it once per process rather than per request.
     """
 
     def __init__(self, cloud_name, api_key, api_secret):
@@ -29,9 +31,19 @@ class UploadFileService:
         )
 
     @staticmethod
-    def upload_file(file, username) -> str:
+    def _upload(file, public_id: str) -> str:
+        r = cloudinary.uploader.upload(file, public_id=public_id, overwrite=True)
+        return cloudinary.CloudinaryImage(public_id).build_url(
+            width=250, height=250, crop="fill", version=r.get("version")
+        )
+
+    @staticmethod
+    async def upload_file(file, username) -> str:
         """Upload the given file and return a Cloudinary image URL.
 
+        The Cloudinary SDK performs blocking HTTP, so the upload runs in the
+        threadpool to keep the event loop free.
+
         Args:
             file: File-like object with a ``file`` attribute (e.g., FastAPI UploadFile).
             username (str): Username used to build the public id.
@@ -41,8 +53,4 @@ class UploadFileService:
         """
 
         public_id = f"RestApp/{username}"
-        r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=r.get("version")
-        )
-        return src_url
+        return await run_in_threadpool(UploadFileService._upload, file.file, public_id)
@@ -1,11 +1,29 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
 
-from libgravatar import Gravatar
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache.user_cache import delete_user_session
 from src.repository.users import UserRepository
 from src.schemas import UserCreate
 
 
+def gravatar_url(email: str) -> str:
+    """Return the Gravatar image URL for ``email``.
+
+    The URL is derived locally from the MD5 of the normalized address, so no
+    request is made to Gravatar.
+
+    Args:
+        email (str): User email address.
+
+    Returns:
+        str: Gravatar avatar URL.
+    """
+
+    digest = hashlib.md5(email.strip().lower().encode("utf-8")).hexdigest()
+    return f"https://www.gravatar.com/avatar/{digest}"
+
+
 class UserService:
     """High-level user operations that orchestrate repository actions.
 
@@ -32,14 +50,7 @@ class UserService:
             User: The newly created user instance.
         """
 
-        avatar = None
-        try:
-            g = Gravatar(body.email)
-            avatar = g.get_image()
-        except Exception as e:
-            print(e)
-
-        return await self.repository.create_user(body, avatar or "")
+        return await self.repository.create_user(body, gravatar_url(body.email))
 
     async def get_user_by_id(self, user_id: int):
         """Return a user by id.
@@ -77,6 +88,19 @@ class UserService:
 
         return await self.repository.get_user_by_email(email)
 
+    async def get_user_by_email_or_username(self, email: str, username: str):
+        """Return a user matching either the email or the username.
+
+        Args:
+            email (str): Email to look up.
+            username (str): Username to look up.
+
+        Returns:
+            User | None: The user if found, otherwise ``None``.
+        """
+
+        return await self.repository.get_user_by_email_or_username(email, username)
+
     async def confirmed_email(self, email: str):
         """Mark the given user's email as confirmed.
 
@@ -102,9 +126,29 @@ class UserService:
 
         return await self.repository.update_avatar_url(email, url)
 
+    async def upgrade_password_hash(self, user, hashed_password: str):
+        """Store a rehashed password for ``user`` after a successful login.
+
+        The password itself is unchanged, so the cached user and refresh
+        token are left in place.
+
+        Args:
+            user (User): User loaded for the login.
+            hashed_password (str): Hash produced with the current scheme.
+
+        Returns:
+            User: The updated user.
+        """
+
+        return await self.repository.update_password_hash(user, hashed_password)
+
     async def update_password(self, email: str, hashed_password: str):
         """Update user's password (hashed) by email.
 
+        The cached user entry and the issued refresh token are dropped, so
+        the next authenticated request reloads the user from the database
+        and existing refresh tokens stop working.
+
         Args:
             email (str): User email.
             hashed_password (str): New hashed password.
@@ -113,4 +157,10 @@ class UserService:
             User | None: Updated user if found, otherwise None.
         """
 
-        return await self.repository.update_password_by_email(email, hashed_password)
+        user = await self.repository.update_password_by_email(email, hashed_password)
+        if user is not None:
+            try:
+                await delete_user_session(user.username)
+            except Exception:
+                pass
+        return user
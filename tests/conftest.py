@@ -1,17 +1,36 @@
 import asyncio
+import inspect
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.pool import StaticPool
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from main import app
-from src.database.models import Base, User
+from src.cache import redis_client
+from src.database.models import Base, User, UserRole
 from src.database.db import get_db
-from src.services.auth import create_access_token, Hash
+from src.services.auth import (
+    Hash,
+    create_access_token,
+    create_email_token,
+    create_password_reset_token,
+)
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# Under pytest-xdist every worker gets its own SQLite file, so modules that
+# reset the schema cannot pull rows out from under another worker.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+_TEST_DB = f"test_{_XDIST_WORKER}.db" if _XDIST_WORKER else "test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///./{_TEST_DB}"
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -23,27 +42,143 @@ TestingSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
 
+# AsyncSession's attribute names and coroutine methods, introspected once.
+# ``AsyncMock(spec=AsyncSession)`` repeats this scan for every mock it builds.
+_SESSION_ATTRS = dir(AsyncSession)
+_SESSION_ASYNC = frozenset(
+    name
+    for name in _SESSION_ATTRS
+    if inspect.iscoroutinefunction(getattr(AsyncSession, name, None))
+)
+
+
+class _MockSession(MagicMock):
+    """Session mock whose coroutine methods (execute, commit, ...) are awaitable."""
+
+    def _get_child_mock(self, /, **kw):
+        if kw.get("_new_name") in _SESSION_ASYNC:
+            return AsyncMock(**kw)
+        return MagicMock(**kw)
+
+
+def make_mock_session() -> MagicMock:
+    """Return a mock ``AsyncSession`` limited to the real session's attributes."""
+
+    return _MockSession(spec=_SESSION_ATTRS)
+
+
+def fake_result(*, rows=(), one=None, scalar=None) -> SimpleNamespace:
+    """Return a stand-in for a SQLAlchemy ``Result`` with fixed answers.
+
+    ``rows`` backs ``scalars().all()``, ``one`` backs ``scalars().one_or_none()``
+    and ``scalar`` backs ``scalar_one()`` / ``scalar_one_or_none()``. Plain
+    callables avoid building a chain of child mocks per test.
+    """
+
+    scalars = SimpleNamespace(all=lambda: list(rows), one_or_none=lambda: one)
+    return SimpleNamespace(
+        scalars=lambda: scalars,
+        scalar_one=lambda: scalar,
+        scalar_one_or_none=lambda: scalar,
+    )
+
+
+def async_return(value):
+    """Return a coroutine function that always resolves to ``value``.
+
+    Cheaper than ``AsyncMock(return_value=...)``; the positional arguments
+    of every call are kept in ``.calls`` for assertions.
+    """
+
+    async def stub(*args, **kwargs):
+        stub.calls.append(args)
+        return value
+
+    stub.calls = []
+    return stub
+
+
+_USER_DEFAULTS = {
+    "hashed_password": "h",
+    "avatar": None,
+    "confirmed": False,
+    "role": UserRole.USER,
+}
+
+
+def make_user(**overrides) -> User:
+    """Build a detached ``User`` for mocked service calls."""
+
+    return User(**{**_USER_DEFAULTS, **overrides})
+
+
 test_user = {
     "username": "deadpool",
     "email": "deadpool@example.com",
     "password": "12345678",
+    "role": "user",
+}
+
+
+# User registered through the API by the auth integration tests.
+user_data = {
+    "username": "agent007",
+    "email": "agent007@gmail.com",
+    "password": "12345678",
+    "role": "user",
 }
 
 
+# Password of extra users that tests insert directly.
+tmp_user_password = "pw123456"
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "fast_auth: reject every password without hashing it"
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fast_auth(request, monkeypatch):
+    # Error-path login tests never need a real password check.
+    if request.node.get_closest_marker("fast_auth") is None:
+        return
+
+    async def reject(self, plain_password, hashed_password):
+        return False
+
+    monkeypatch.setattr(Hash, "verify_password", reject)
+
+
+@pytest.fixture(scope="session")
+def password_hashes() -> dict[str, str]:
+    """Hash the shared test passwords once per run; hashing is deliberately slow."""
+
+    async def hash_all():
+        hasher = Hash()
+        return {
+            pwd: await hasher.get_password_hash(pwd)
+            for pwd in (test_user["password"], tmp_user_password)
+        }
+
+    return asyncio.run(hash_all())
+
+
 @pytest.fixture(scope="module", autouse=True)
-def init_models_wrap():
+def init_models_wrap(password_hashes):
     async def init_models():
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
             await conn.run_sync(Base.metadata.create_all)
         async with TestingSessionLocal() as session:
-            hash_password = Hash().get_password_hash(test_user["password"])
             current_user = User(
                 username=test_user["username"],
                 email=test_user["email"],
-                hashed_password=hash_password,
+                hashed_password=password_hashes[test_user["password"]],
                 confirmed=True,
                 avatar="<https://twitter.com/gravatar>",
+                role=test_user["role"],
             )
             session.add(current_user)
             await session.commit()
@@ -51,24 +186,70 @@ def init_models_wrap():
     asyncio.run(init_models())
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def client():
-    # Dependency override
+    # One client (and app lifespan) for the whole run; the schema is still
+    # reset per module by ``init_models_wrap``.
 
     async def override_get_db():
         async with TestingSessionLocal() as session:
             try:
                 yield session
-            except Exception as err:
+            except Exception:
                 await session.rollback()
                 raise
 
     app.dependency_overrides[get_db] = override_get_db
 
-    yield TestClient(app)
+    # Entering the client runs the lifespan on a single portal loop, so the
+    # shared Redis client stays on one loop and is closed at shutdown.
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture()
+async def async_client(client, monkeypatch):
+    # Serves the app on the test's own event loop, without the TestClient
+    # portal thread. ``client`` is requested for its get_db override. The
+    # shared Redis client is bound to the portal loop, so this loop gets its
+    # own for the duration of the test.
+    monkeypatch.setattr(redis_client, "_client", None)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    await redis_client.close_redis()
+
+
+@pytest.fixture(autouse=True)
+def restore_dependency_overrides():
+    # The app outlives each test; undo overrides a test forgot to pop.
+    saved = dict(app.dependency_overrides)
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved)
+
+
+@pytest.fixture(autouse=True)
+def _stub_send_email(monkeypatch):
+    # Never reach SMTP from tests; background tasks await a no-op instead.
+    async def noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr("src.api.users.send_email", noop)
+    monkeypatch.setattr("src.api.users.send_password_reset_email", noop)
+
+
+@pytest.fixture(scope="session")
+def confirmed_email_token():
+    return create_email_token({"sub": test_user["email"]})
+
+
+@pytest.fixture(scope="session")
+def password_reset_token():
+    return create_password_reset_token({"sub": user_data["email"]})
 
 
 @pytest_asyncio.fixture()
 async def get_token():
-    token = await create_access_token(data={"sub": test_user["username"]})
+    token = create_access_token(data={"sub": test_user["username"]})
     return token
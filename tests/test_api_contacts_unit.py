@@ -1,9 +1,10 @@
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
 from src.api import contacts as contacts_api
 from src.schemas import ContactModel
-from src.database.models import User
+from src.database.models import Contact, User
 
 
 @pytest.mark.asyncio
@@ -16,17 +17,54 @@ async def test_get_contacts_delegates(monkeypatch):
     db = MagicMock()
 
     res = await contacts_api.get_contacts(
-        skip=0, limit=10, name="a", last_name="b", email="c", user=user, db=db
+        skip=0,
+        limit=10,
+        name="a",
+        last_name="b",
+        email="c",
+        prefix=True,
+        user=user,
+        db=db,
     )
 
-    assert res == [{"id": 1}]
-    mock_service.get_contacts.assert_awaited_once_with(user, 0, 10, "a", "b", "c")
+    assert orjson.loads(res.body) == [{"id": 1}]
+    mock_service.get_contacts.assert_awaited_once_with(
+        user, 0, 10, "a", "b", "c", True
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_summary_delegates(monkeypatch):
+    mock_service = MagicMock()
+    mock_service.get_contacts_summary = AsyncMock(return_value=[{"id": 1}])
+    monkeypatch.setattr("src.api.contacts.ContactsService", lambda db: mock_service)
+
+    user = User(id=1, username="u")
+
+    res = await contacts_api.get_contacts_summary(
+        skip=5,
+        limit=10,
+        name=None,
+        last_name=None,
+        email=None,
+        prefix=False,
+        user=user,
+        db=MagicMock(),
+    )
+
+    assert orjson.loads(res.body) == [{"id": 1}]
+    mock_service.get_contacts_summary.assert_awaited_once_with(
+        user, 5, 10, None, None, None, False
+    )
 
 
 @pytest.mark.asyncio
 async def test_get_upcoming_birthdays_delegates(monkeypatch):
     mock_service = MagicMock()
-    mock_service.get_upcoming_birthdays = AsyncMock(return_value=[{"id": 2}])
+    contact = Contact(
+        id=2, name="N", last_name="L", email="b@example.com", phone="222"
+    )
+    mock_service.get_upcoming_birthdays = AsyncMock(return_value=[contact])
     monkeypatch.setattr("src.api.contacts.ContactsService", lambda db: mock_service)
 
     user = User(id=2, username="u2")
@@ -34,7 +72,8 @@ async def test_get_upcoming_birthdays_delegates(monkeypatch):
 
     res = await contacts_api.get_upcoming_birthdays(days=5, db=db, user=user)
 
-    assert res == [{"id": 2}]
+    data = orjson.loads(res.body)
+    assert [c["id"] for c in data] == [2]
     mock_service.get_upcoming_birthdays.assert_awaited_once_with(user, 5)
 
 
@@ -110,3 +149,26 @@ async def test_delete_contact_delegates(monkeypatch):
 
     assert res == {"id": 6}
     mock_service.remove_contact.assert_awaited_once_with(6, user)
+
+
+def test_integrity_error_uses_driver_constraint_name():
+    from fastapi import HTTPException
+    from sqlalchemy.exc import IntegrityError
+
+    from src.services.contacts import _handle_integrity_error
+
+    def integrity_error(constraint_name):
+        # Mirrors SQLAlchemy's asyncpg adapter chaining the driver error
+        cause = Exception("duplicate key value violates unique constraint")
+        cause.constraint_name = constraint_name
+        orig = Exception(str(cause))
+        orig.__cause__ = cause
+        return IntegrityError("INSERT ...", {}, orig)
+
+    with pytest.raises(HTTPException) as exc:
+        _handle_integrity_error(integrity_error("uix_email_phone_userid"))
+    assert exc.value.status_code == 409
+
+    with pytest.raises(HTTPException) as exc:
+        _handle_integrity_error(integrity_error("contacts_user_id_fkey"))
+    assert exc.value.status_code == 400
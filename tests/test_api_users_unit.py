@@ -0,0 +1,312 @@
+import orjson
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+from fastapi import HTTPException
+
+from src.api import users as users_api
+from src.database.models import UserRole
+from src.schemas import RequestEmail, ResetPasswordRequest, UserCreate
+from tests.conftest import make_user, user_data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cached_avatar,expected",
+    [("", None), ("http://a/b.png", "http://a/b.png")],
+    ids=["no-avatar", "avatar"],
+)
+async def test_me_sends_missing_avatar_as_null(monkeypatch, cached_avatar, expected):
+    cached = {
+        "id": 1,
+        "username": "u",
+        "email": "u@example.com",
+        "avatar": cached_avatar,
+        "confirmed": True,
+        "role": "user",
+    }
+    monkeypatch.setattr(
+        "src.api.users.get_cached_user", AsyncMock(return_value=cached)
+    )
+
+    res = await users_api.me(claims={"sub": "u"}, db=None)
+
+    assert orjson.loads(res.body)["avatar"] == expected
+
+
+def test_me_documents_user_schema():
+    from main import app
+
+    schema = app.openapi()["paths"]["/api/auth/me"]["get"]["responses"]["200"]
+    ref = schema["content"]["application/json"]["schema"]["$ref"]
+    assert ref.endswith("/User")
+
+
+@pytest.fixture
+def patched_user_service(monkeypatch):
+    """Replace ``UserService`` in the users API with one shared mock."""
+
+    service = MagicMock()
+    for name in (
+        "get_user_by_email",
+        "get_user_by_username",
+        "get_user_by_email_or_username",
+        "confirmed_email",
+        "upgrade_password_hash",
+    ):
+        setattr(service, name, AsyncMock(return_value=None))
+    monkeypatch.setattr("src.api.users.UserService", lambda db: service)
+    return service
+
+
+_BRANCH_USERS = {
+    "confirmed": {"confirmed": True},
+    "unconfirmed": {"confirmed": False},
+    "missing": None,
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "user_state,expected_msg,expect_bg_call",
+    [
+        ("confirmed", "Your email is already verified", False),
+        ("unconfirmed", "Please check your email to confirm", True),
+        ("missing", "Please check your email to confirm", False),
+    ],
+)
+async def test_request_email_branches(
+    patched_user_service, user_state, expected_msg, expect_bg_call
+):
+    overrides = _BRANCH_USERS[user_state]
+    user = None if overrides is None else make_user(email="u500@x.com", **overrides)
+    patched_user_service.get_user_by_email.return_value = user
+
+    bg = MagicMock()
+    res = await users_api.request_email(
+        body=RequestEmail(email="u500@x.com"),
+        background_tasks=bg,
+        host="http://test",
+        db=MagicMock(),
+    )
+    assert res == {"message": expected_msg}
+    assert bg.add_task.called is expect_bg_call
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("user_state", ["confirmed", "missing"])
+async def test_request_password_reset_branches(patched_user_service, user_state):
+    overrides = _BRANCH_USERS[user_state]
+    user = None if overrides is None else make_user(email="u600@x.com", **overrides)
+    patched_user_service.get_user_by_email.return_value = user
+
+    bg = MagicMock()
+    res = await users_api.request_password_reset(
+        body=ResetPasswordRequest(email="u600@x.com"),
+        background_tasks=bg,
+        host="http://test",
+        db=MagicMock(),
+    )
+    # Same generic message either way; only an existing user gets an email.
+    assert res == {"message": "If an account with that email exists, check your inbox"}
+    assert bg.add_task.called is (user is not None)
+
+
+@pytest.mark.asyncio
+async def test_confirmed_email_user_not_found(monkeypatch, patched_user_service):
+    monkeypatch.setattr(
+        "src.api.users.get_email_from_token",
+        Mock(return_value="missing@example.com"),
+    )
+    patched_user_service.get_user_by_email.return_value = None
+
+    db = MagicMock()
+
+    with pytest.raises(HTTPException) as exc:
+        await users_api.confirmed_email(token="t", db=db)
+
+    assert exc.value.status_code == 400
+    assert "Verification error" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_confirmed_email_ignores_cache_errors(monkeypatch, patched_user_service):
+    monkeypatch.setattr(
+        "src.api.users.get_email_from_token", Mock(return_value=user_data["email"])
+    )
+    user = make_user(id=300, username="u300", email=user_data["email"])
+    patched_user_service.get_user_by_email.return_value = user
+    monkeypatch.setattr(
+        "src.api.users.set_user_cache", AsyncMock(side_effect=Exception("cache down"))
+    )
+
+    db = MagicMock()
+    res = await users_api.confirmed_email(token="t", db=db)
+
+    assert res == {"message": "Email has been verified"}
+
+
+@pytest.mark.asyncio
+async def test_login_invalid_password_branch(monkeypatch, patched_user_service):
+    user = make_user(id=400, username="u400", email="u400@x.com", confirmed=True)
+    patched_user_service.get_user_by_username.return_value = user
+    monkeypatch.setattr(
+        "src.services.auth.Hash.verify_password", AsyncMock(return_value=False)
+    )
+
+    form = MagicMock()
+    form.username = "u400"
+    form.password = "wrong"
+    db = MagicMock()
+
+    with pytest.raises(HTTPException) as exc:
+        await users_api.login_user(form_data=form, db=db)
+
+    assert exc.value.status_code == 401
+    assert "Invalid username or password" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_login_raises_invalid_credentials(patched_user_service):
+
+    patched_user_service.get_user_by_username.return_value = None
+
+    form = MagicMock()
+    form.username = "nonexistent"
+    form.password = "pw"
+    db = MagicMock()
+
+    with pytest.raises(HTTPException) as exc:
+        await users_api.login_user(form_data=form, db=db)
+
+    assert exc.value.status_code == 401
+    assert "Invalid username or password" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_login_raises_unverified_email(monkeypatch, patched_user_service):
+
+    user = make_user(id=200, username="u200", email="u200@x.com")
+    patched_user_service.get_user_by_username.return_value = user
+    monkeypatch.setattr(
+        "src.services.auth.Hash.verify_password", AsyncMock(return_value=True)
+    )
+
+    form = MagicMock()
+    form.username = "u200"
+    form.password = "pw"
+    db = MagicMock()
+
+    with pytest.raises(HTTPException) as exc:
+        await users_api.login_user(form_data=form, db=db)
+
+    assert exc.value.status_code == 401
+    assert "Email address not verified" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_register_raises_on_existing_email(patched_user_service):
+    existing = make_user(id=99, username="dup", email=user_data["email"])
+    patched_user_service.get_user_by_email_or_username.return_value = existing
+
+    background = MagicMock()
+    db = MagicMock()
+
+    body = UserCreate(
+        username="newuser", email=user_data["email"], password="pw", role=UserRole.USER
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await users_api.register_user(
+            user_data=body, background_tasks=background, host="http://test", db=db
+        )
+
+    assert exc.value.status_code == 409
+    assert "A user with this email already exists" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_register_raises_on_existing_username(patched_user_service):
+    existing = make_user(
+        id=100,
+        username=user_data["username"],
+        email="other@example.com",
+    )
+    patched_user_service.get_user_by_email_or_username.return_value = existing
+
+    background = MagicMock()
+    db = MagicMock()
+
+    body = UserCreate(
+        username=user_data["username"],
+        email="new@example.com",
+        password="pw",
+        role=UserRole.USER,
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await users_api.register_user(
+            user_data=body, background_tasks=background, host="http://test", db=db
+        )
+
+    assert exc.value.status_code == 409
+    assert "A user with this username already exists" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_login_fails_when_session_cannot_be_stored(
+    monkeypatch, patched_user_service
+):
+    from src.cache.metrics import cache_stats
+
+    user = make_user(id=501, username="u501", email="u501@x.com", confirmed=True)
+    patched_user_service.get_user_by_username.return_value = user
+    monkeypatch.setattr(
+        "src.api.users.Hash.verify_password", AsyncMock(return_value=True)
+    )
+    monkeypatch.setattr("src.api.users.Hash.needs_rehash", lambda self, h: False)
+    monkeypatch.setattr(
+        "src.api.users.set_user_session",
+        AsyncMock(side_effect=Exception("redis down")),
+    )
+    before = cache_stats["session_store_error"]
+
+    form = MagicMock()
+    form.username = "u501"
+    form.password = "pw"
+    with pytest.raises(HTTPException) as exc:
+        await users_api.login_user(form_data=form, db=MagicMock())
+
+    assert exc.value.status_code == 503
+    assert cache_stats["session_store_error"] == before + 1
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_bcrypt_hash(monkeypatch, patched_user_service):
+    import bcrypt
+
+    from src.services.auth import Hash
+
+    legacy = bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=4)).decode()
+    user = make_user(
+        id=500,
+        username="u500",
+        email="u500@x.com",
+        hashed_password=legacy,
+        avatar="",
+        confirmed=True,
+    )
+    patched_user_service.get_user_by_username.return_value = user
+    monkeypatch.setattr("src.api.users.set_user_session", AsyncMock())
+
+    form = MagicMock()
+    form.username = "u500"
+    form.password = "pw"
+
+    response = await users_api.login_user(form_data=form, db=MagicMock())
+
+    assert "access_token" in response
+    new_hash = patched_user_service.upgrade_password_hash.await_args.args[1]
+    assert new_hash.startswith("$argon2id$")
+    assert await Hash().verify_password("pw", new_hash)
+    assert not Hash().needs_rehash(new_hash)
@@ -0,0 +1,158 @@
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from fastapi import HTTPException
+
+from tests.conftest import make_user, user_data
+
+
+@pytest.mark.asyncio
+async def test_password_hashes_run_concurrently(monkeypatch):
+    import asyncio
+    import threading
+
+    import anyio
+
+    from src.services import auth as auth_service
+
+    monkeypatch.setattr(auth_service, "_hash_limiter", anyio.CapacityLimiter(3))
+    # Every call waits for the other two, so this only passes if all three
+    # are on worker threads at the same time.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def work(x):
+        barrier.wait()
+        if x < 0:
+            raise ValueError("negative")
+        return x * 2
+
+    results = await asyncio.gather(
+        auth_service._run_hash(work, 1),
+        auth_service._run_hash(work, 2),
+        auth_service._run_hash(work, -1),
+        return_exceptions=True,
+    )
+
+    assert results[:2] == [2, 4]
+    assert isinstance(results[2], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_uses_claims_without_lookup(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.services import auth as auth_service
+
+    lookup = AsyncMock()
+    monkeypatch.setattr(auth_service, "get_current_user", lookup)
+    request = SimpleNamespace(state=SimpleNamespace())
+    claims = {"sub": "agent007", "uid": 42, "role": "user"}
+
+    user = await auth_service.get_current_user_id(request, claims, db=None)
+
+    assert (user.id, user.username, user.role) == (42, "agent007", "user")
+    lookup.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_verify_refresh_token_uses_cached_user(monkeypatch):
+    from src.services import auth as auth_service
+
+    token = auth_service.create_token(
+        {"sub": "agent007", "jti": "abc123"}, auth_service._REFRESH_TD, "refresh"
+    )
+    cached = {
+        "id": 1,
+        "username": "agent007",
+        "email": "agent007@gmail.com",
+        "avatar": "",
+        "confirmed": True,
+        "role": "user",
+    }
+    monkeypatch.setattr(
+        auth_service, "get_refresh_jti", AsyncMock(return_value="abc123")
+    )
+    monkeypatch.setattr(auth_service, "get_user_cache", AsyncMock(return_value=cached))
+
+    # No session: a cache hit must not touch the database
+    user = await auth_service.verify_refresh_token(token, db=None)
+
+    assert user.id == 1 and user.username == "agent007"
+
+
+def test_user_schema_reused_until_cache_entry_changes(monkeypatch):
+    from src.services import auth as auth_service
+
+    cached = {
+        "id": 7,
+        "username": "schema-user",
+        "email": "schema@example.com",
+        "avatar": "",
+        "confirmed": True,
+        "role": "user",
+    }
+
+    validate = Mock(wraps=auth_service.UserSchema.model_validate)
+    monkeypatch.setattr(auth_service.UserSchema, "model_validate", validate)
+
+    first = auth_service._user_schema(cached)
+    second = auth_service._user_schema(dict(cached))
+    assert validate.call_count == 1
+    # Callers get their own copy; mutating one does not leak into the next
+    assert second == first and second is not first
+    second.avatar = "changed"
+    assert auth_service._user_schema(cached).avatar == ""
+
+    # A changed cache entry is validated again
+    updated = auth_service._user_schema({**cached, "avatar": "http://a/b.png"})
+    assert validate.call_count == 2
+    assert updated.avatar == "http://a/b.png"
+
+
+@pytest.mark.asyncio
+async def test_get_cached_user_queries_db_when_cache_is_slow(monkeypatch):
+    import asyncio
+
+    from src.cache.metrics import cache_stats
+    from src.services import auth as auth_service
+
+    async def slow_cache(username):
+        await asyncio.sleep(0.05)
+        return None
+
+    user = make_user(
+        id=600,
+        username="u600",
+        email="u600@x.com",
+        avatar="",
+        confirmed=True,
+    )
+    mock_service = MagicMock()
+    mock_service.get_user_by_username = AsyncMock(return_value=user)
+    monkeypatch.setattr(auth_service, "get_user_cache", slow_cache)
+    monkeypatch.setattr(auth_service, "set_user_cache", AsyncMock())
+    monkeypatch.setattr(auth_service, "UserService", lambda db: mock_service)
+    slow_before = cache_stats["user_cache_slow"]
+
+    cached = await auth_service.get_cached_user("u600", db=None)
+
+    assert cached["id"] == 600
+    assert cache_stats["user_cache_slow"] == slow_before + 1
+    mock_service.get_user_by_username.assert_awaited_once_with("u600")
+
+
+def test_password_reset_token_is_bound_to_its_audience(
+    password_reset_token, confirmed_email_token
+):
+    from src.services.auth import (
+        get_email_from_password_reset_token,
+        get_email_from_token,
+    )
+
+    email = get_email_from_password_reset_token(password_reset_token)
+    assert email == user_data["email"]
+
+    with pytest.raises(HTTPException):
+        get_email_from_token(password_reset_token)
+    with pytest.raises(HTTPException):
+        get_email_from_password_reset_token(confirmed_email_token)
@@ -1,22 +1,36 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
 from datetime import date, timedelta
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects import postgresql
 
 from src.database.models import Contact, User
-from src.repository.contacts import ContactsRepository
+from src.repository.contacts import ContactsRepository, upcoming_mmdd
+from tests.conftest import async_return, fake_result, make_mock_session
 from src.schemas import ContactModel
 
 
+# Pin "today" so the birthday window does not move with the calendar.
+TODAY = date(2024, 6, 1)
+UPCOMING_DAYS = 7
+BIRTH_DATE_IN = date(1990, TODAY.month, TODAY.day)
+_OUT_TARGET = TODAY + timedelta(days=UPCOMING_DAYS + 5)
+BIRTH_DATE_OUT = date(1990, _OUT_TARGET.month, _OUT_TARGET.day)
+
+
+class _FrozenDate(date):
+    @classmethod
+    def today(cls):
+        return TODAY
+
+
+@pytest.fixture(autouse=True)
+def frozen_today(monkeypatch):
+    monkeypatch.setattr("src.repository.contacts.date", _FrozenDate)
+
+
 @pytest.fixture
 def mock_session():
-    mock_session = AsyncMock(spec=AsyncSession)
-    mock_session.add = MagicMock()
-    mock_session.commit = AsyncMock()
-    mock_session.refresh = AsyncMock()
-    mock_session.delete = AsyncMock()
-    return mock_session
+    return make_mock_session()
 
 
 @pytest.fixture
@@ -29,152 +43,208 @@ def user():
     return User(id=1, username="testuser")
 
 
+def _contact(user, **fields):
+    values = dict(
+        id=1,
+        name="John",
+        last_name="Doe",
+        email="j@example.com",
+        phone="123",
+        user=user,
+    )
+    values.update(fields)
+    return Contact(**values)
+
+
+_CREATE_BODY = ContactModel(
+    name="New",
+    last_name="Person",
+    email="new@example.com",
+    phone="555",
+    additional_info="",
+)
+
+_UPDATE_BODY = ContactModel(
+    name="Updated",
+    last_name="Person",
+    email="u@example.com",
+    phone="000",
+    additional_info="",
+)
+
+
+@pytest.mark.parametrize(
+    "method,kwargs,result_kind,sql_prefix",
+    [
+        pytest.param(
+            "get_contacts",
+            {"skip": 0, "limit": 10},
+            "rows",
+            "SELECT",
+            id="get_contacts",
+        ),
+        pytest.param(
+            "get_contact_by_id",
+            {"contact_id": 1},
+            "one",
+            "SELECT",
+            id="get_contact_by_id",
+        ),
+        pytest.param(
+            "update_contact",
+            {"contact_id": 1, "body": _UPDATE_BODY},
+            "scalar",
+            "UPDATE contacts SET",
+            id="update_contact",
+        ),
+        pytest.param(
+            "remove_contact",
+            {"contact_id": 1},
+            "scalar",
+            "DELETE FROM contacts",
+            id="remove_contact",
+        ),
+    ],
+)
 @pytest.mark.asyncio
-async def test_get_contacts(contact_repository, mock_session, user):
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = [
-        Contact(
-            id=1,
-            name="John",
-            last_name="Doe",
-            email="j@example.com",
-            phone="123",
-            user=user,
-        )
-    ]
-    mock_session.execute = AsyncMock(return_value=mock_result)
-
-    contacts = await contact_repository.get_contacts(skip=0, limit=10, user=user)
-
-    assert len(contacts) == 1
-    assert contacts[0].name == "John"
+async def test_contact_crud(
+    contact_repository, mock_session, user, method, kwargs, result_kind, sql_prefix
+):
+    contact = _contact(user)
+    value = [contact] if result_kind == "rows" else contact
+    mock_result = fake_result(**{result_kind: value})
+    mock_session.execute = async_return(mock_result)
+
+    result = await getattr(contact_repository, method)(user=user, **kwargs)
+
+    if isinstance(result, list):
+        assert len(result) == 1
+        result = result[0]
+    assert result is contact
+    assert len(mock_session.execute.calls) == 1
+    sql = str(mock_session.execute.calls[0][0].compile())
+    assert sql.startswith(sql_prefix)
+    if sql_prefix == "SELECT":
+        mock_session.commit.assert_not_awaited()
+    else:
+        assert "RETURNING" in sql
+        mock_session.commit.assert_awaited_once()
+        mock_session.refresh.assert_not_awaited()
+        mock_session.delete.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_get_contact_by_id(contact_repository, mock_session, user):
-    existing = Contact(
-        id=1,
-        name="Jane",
-        last_name="Smith",
-        email="s@example.com",
-        phone="321",
-        user=user,
-    )
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.one_or_none.return_value = existing
-    mock_session.execute = AsyncMock(return_value=mock_result)
+async def test_get_contacts_prefix_search(contact_repository, mock_session, user):
+    mock_result = fake_result(rows=[])
+    mock_session.execute = async_return(mock_result)
 
-    contact = await contact_repository.get_contact_by_id(contact_id=1, user=user)
+    await contact_repository.get_contacts(
+        skip=0, limit=10, user=user, name="Jo", email="j@", prefix=True
+    )
 
-    assert contact is not None
-    assert contact.id == 1
-    assert contact.name == "Jane"
+    stmt = mock_session.execute.calls[0][0]
+    sql = str(
+        stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "lower(contacts.name) LIKE 'jo%%'" in sql
+    assert "lower(contacts.email) LIKE 'j@%%'" in sql
+    assert "ILIKE" not in sql
 
 
 @pytest.mark.asyncio
-async def test_create_contact(contact_repository, mock_session, user):
-    contact_data = ContactModel(
-        name="New",
-        last_name="Person",
-        email="new@example.com",
-        phone="555",
-        additional_info="",
-    )
+async def test_get_contacts_escapes_like_wildcards(
+    contact_repository, mock_session, user
+):
+    mock_result = fake_result(rows=[])
+    mock_session.execute = async_return(mock_result)
 
-    result = await contact_repository.create_contact(body=contact_data, user=user)
+    await contact_repository.get_contacts(skip=0, limit=10, user=user, name="50%_a\\")
 
-    assert isinstance(result, Contact)
-    assert result.name == "New"
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+    compiled = mock_session.execute.calls[0][0].compile()
+    assert "%50\\%\\_a\\\\%" in compiled.params.values()
+    assert "ESCAPE" in str(compiled)
 
 
 @pytest.mark.asyncio
-async def test_update_contact(contact_repository, mock_session, user):
-    existing = Contact(
-        id=1,
-        name="Old",
-        last_name="Person",
-        email="o@example.com",
-        phone="000",
-        user=user,
-    )
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.one_or_none.return_value = existing
-    mock_session.execute = AsyncMock(return_value=mock_result)
-
-    body = ContactModel(
-        name="Updated",
-        last_name="Person",
-        email="u@example.com",
-        phone="000",
-        additional_info="",
-    )
+async def test_get_contacts_summary_loads_list_columns(
+    contact_repository, mock_session, user
+):
+    mock_result = fake_result(rows=[])
+    mock_session.execute = async_return(mock_result)
 
-    updated = await contact_repository.update_contact(
-        contact_id=1, body=body, user=user
-    )
+    await contact_repository.get_contacts_summary(skip=0, limit=10, user=user)
 
-    assert updated is not None
-    assert updated.name == "Updated"
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(existing)
+    sql = str(mock_session.execute.calls[0][0].compile())
+    assert "contacts.phone" in sql
+    assert "additional_info" not in sql
+    assert "birth_date" not in sql
 
 
 @pytest.mark.asyncio
-async def test_remove_contact(contact_repository, mock_session, user):
-    existing = Contact(
-        id=1,
-        name="ToDelete",
-        last_name="Person",
-        email="d@example.com",
-        phone="999",
-        user=user,
-    )
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.one_or_none.return_value = existing
-    mock_session.execute = AsyncMock(return_value=mock_result)
+async def test_create_contact(contact_repository, mock_session, user):
+    created = Contact(id=7, user_id=user.id, **_CREATE_BODY.model_dump())
+    mock_result = fake_result(scalar=created)
+    mock_session.execute = async_return(mock_result)
 
-    result = await contact_repository.remove_contact(contact_id=1, user=user)
+    result = await contact_repository.create_contact(body=_CREATE_BODY, user=user)
 
-    assert result is not None
-    assert result.name == "ToDelete"
-    mock_session.delete.assert_awaited_once_with(existing)
+    assert isinstance(result, Contact)
+    assert result.name == "New"
+    stmt = mock_session.execute.calls[0][0]
+    assert str(stmt.compile()).startswith("INSERT INTO contacts")
+    assert stmt.compile().params["user_id"] == user.id
     mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_get_upcoming_birthdays(contact_repository, mock_session, user):
-    today = date.today()
-    days = 7
-
     contact_in = Contact(
         id=1,
         name="In",
         last_name="Birthday",
         email="in@example.com",
         phone="111",
-        birth_date=date(1990, today.month, today.day),
+        birth_date=BIRTH_DATE_IN,
         user=user,
     )
 
-    future_target = today + timedelta(days=days + 5)
     contact_out = Contact(
         id=2,
         name="Out",
         last_name="Birthday",
         email="out@example.com",
         phone="222",
-        birth_date=date(1990, future_target.month, future_target.day),
+        birth_date=BIRTH_DATE_OUT,
         user=user,
     )
 
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = [contact_in, contact_out]
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_result = fake_result(rows=[contact_in])
+    mock_session.execute = async_return(mock_result)
 
-    upcoming = await contact_repository.get_upcoming_birthdays(user=user, days=days)
+    upcoming = await contact_repository.get_upcoming_birthdays(
+        user=user, days=UPCOMING_DAYS
+    )
 
     assert len(upcoming) == 1
     assert upcoming[0].name == "In"
+
+    # Filtering happens in SQL against the month/day window
+    stmt = mock_session.execute.calls[0][0]
+    compiled = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    window = upcoming_mmdd(TODAY, UPCOMING_DAYS)
+    assert "EXTRACT(month FROM contacts.birth_date) * 100" in str(compiled)
+    assert "IN (601, 602, 603, 604, 605, 606, 607, 608)" in str(compiled)
+    assert BIRTH_DATE_IN.month * 100 + BIRTH_DATE_IN.day in window
+    assert BIRTH_DATE_OUT.month * 100 + BIRTH_DATE_OUT.day not in window
+    assert len(window) == UPCOMING_DAYS + 1
+
+
+def test_upcoming_mmdd_wraps_year_and_leap_day():
+    assert upcoming_mmdd(date(2025, 12, 30), 3) == [101, 102, 1230, 1231]
+    assert upcoming_mmdd(date(2025, 2, 27), 2) == [227, 228, 229, 301]
+    assert upcoming_mmdd(date(2024, 2, 28), 1) == [228, 229]
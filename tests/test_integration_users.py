@@ -1,44 +1,54 @@
 import pytest
-from unittest.mock import Mock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
-from src.services.auth import create_email_token
-from src.services.auth import Hash
 from src.database.models import User
-from tests.conftest import test_user
+from tests.conftest import test_user, tmp_user_password
 from tests.conftest import TestingSessionLocal
 from main import app
 import src.services.auth as auth_service
 
 
 @pytest.mark.asyncio
-async def test_me_endpoint(client, get_token):
+async def test_me_endpoint(async_client, get_token):
     token = get_token
 
-    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    response = await async_client.get(
+        "/api/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
     assert response.status_code == 200, response.text
     data = response.json()
     assert "username" in data
 
 
-def test_confirmed_email_already_verified(client):
+@pytest.mark.asyncio
+async def test_me_endpoint_rate_limited(client, get_token, monkeypatch):
+    # Pin the limiter clock so both calls land in the same one-second window
+    monkeypatch.setattr("src.conf.limiter.time", SimpleNamespace(time=lambda: 1e9))
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    client.get("/api/auth/me", headers=headers)
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 429, response.text
+    assert response.json() == {"error": "Too many requests. Please try again later."}
+
 
-    token = create_email_token({"sub": test_user["email"]})
-    response = client.get(f"/api/auth/confirmed_email/{token}")
+def test_confirmed_email_already_verified(client, confirmed_email_token):
+
+    response = client.get(f"/api/auth/confirmed_email/{confirmed_email_token}")
     assert response.status_code == 200, response.text
     data = response.json()
     assert data["message"] == "Your email is already verified"
 
 
 @pytest.mark.asyncio
-async def test_request_email_for_unconfirmed_user(client, monkeypatch):
+async def test_request_email_for_unconfirmed_user(async_client, password_hashes):
 
     async with TestingSessionLocal() as session:
-        pwd = "pw123456"
-        hash_password = Hash().get_password_hash(pwd)
         tmp_user = User(
             username="tmpuser",
             email="tmpuser@example.com",
-            hashed_password=hash_password,
+            hashed_password=password_hashes[tmp_user_password],
             confirmed=False,
             avatar="",
             role="user",
@@ -46,10 +56,7 @@ async def test_request_email_for_unconfirmed_user(client, monkeypatch):
         session.add(tmp_user)
         await session.commit()
 
-    mock_send = Mock()
-    monkeypatch.setattr("src.api.users.send_email", mock_send)
-
-    response = client.post(
+    response = await async_client.post(
         "/api/auth/request_email", json={"email": "tmpuser@example.com"}
     )
     assert response.status_code == 200, response.text
@@ -57,30 +64,102 @@ async def test_request_email_for_unconfirmed_user(client, monkeypatch):
     assert data["message"] == "Please check your email to confirm"
 
 
+@pytest.mark.parametrize("as_admin", [True, False], ids=["admin", "user"])
 @pytest.mark.asyncio
-async def test_update_avatar_endpoint(client, get_token, monkeypatch):
+async def test_update_avatar_endpoint(
+    async_client, get_token, monkeypatch, as_admin
+):
     token = get_token
 
-    app.dependency_overrides[auth_service.get_current_admin_user] = lambda: User(
-        username=test_user["username"],
-        email=test_user["email"],
-        hashed_password="h",
-        confirmed=True,
-        avatar="",
-        role="admin",
-    )
+    if as_admin:
+        app.dependency_overrides[auth_service.get_current_admin_user] = lambda: User(
+            username=test_user["username"],
+            email=test_user["email"],
+            hashed_password="h",
+            confirmed=True,
+            avatar="",
+            role="admin",
+        )
 
-    monkeypatch.setattr(
-        "src.api.users.UploadFileService.upload_file",
-        staticmethod(lambda file, username: "http://avatar.example/img.png"),
-    )
+    upload = AsyncMock(return_value="http://avatar.example/img.png")
+    monkeypatch.setattr("src.api.users.UploadFileService.upload_file", upload)
 
     files = {"file": ("avatar.png", b"data", "image/png")}
-    response = client.patch(
+    response = await async_client.patch(
         "/api/auth/avatar", headers={"Authorization": f"Bearer {token}"}, files=files
     )
+
+    if as_admin:
+        assert response.status_code == 200, response.text
+        assert response.json().get("avatar") == "http://avatar.example/img.png"
+    else:
+        # The seeded test user has the plain "user" role
+        assert response.status_code == 403, response.text
+        upload.assert_not_awaited()
+
+
+def test_debug_pool_requires_admin(client, monkeypatch):
+    from src.database.db import DatabaseSessionManager
+
+    # A server URL gives a sized QueuePool without needing a live database
+    manager = DatabaseSessionManager("postgresql+asyncpg://u:p@localhost/contacts")
+    monkeypatch.setattr("src.api.utils.sessionmanager", manager)
+
+    response = client.get("/api/debug/pool")
+    assert response.status_code == 401, response.text
+
+    app.dependency_overrides[auth_service.get_current_admin_user] = lambda: None
+    try:
+        response = client.get("/api/debug/pool")
+    finally:
+        app.dependency_overrides.pop(auth_service.get_current_admin_user, None)
     assert response.status_code == 200, response.text
-    data = response.json()
-    assert data.get("avatar") == "http://avatar.example/img.png"
+    assert response.json()["pool"].startswith("Pool size:")
+
+
+def test_gravatar_url_normalizes_email():
+    from src.services.users import gravatar_url
+
+    assert gravatar_url(" MyEmailAddress@example.com ") == (
+        "https://www.gravatar.com/avatar/0bc83cb571cd1c50ba6f3e8a78ef1346"
+    )
+
+
+@pytest.mark.asyncio
+async def test_user_cache_ignores_legacy_json_entries(monkeypatch):
+    from src.cache import redis_client, user_cache
+
+    # The portal loop owns the shared client; use one bound to this loop
+    monkeypatch.setattr(redis_client, "_client", None)
+    r = redis_client.get_redis()
+    try:
+        # Entries from before the switch to hashes are plain JSON strings
+        await r.set("user:legacy", b'{"username": "legacy"}', ex=60)
+        user = {
+            "id": 9,
+            "username": "legacy",
+            "email": "legacy@example.com",
+            "avatar": "",
+            "confirmed": True,
+            "role": "user",
+        }
+        await user_cache.set_user_cache(user)
+        user_cache._local_users.pop("legacy", None)
+
+        assert await user_cache.get_user_cache("legacy") == user
+    finally:
+        await r.delete("user:legacy")
+        await user_cache.delete_user_cache("legacy")
+        await redis_client.close_redis()
+
+
+@pytest.mark.asyncio
+async def test_session_manager_accepts_sqlite_memory_url():
+    from sqlalchemy import text
+
+    from src.database.db import DatabaseSessionManager
 
-    app.dependency_overrides.pop(auth_service.get_current_admin_user, None)
+    manager = DatabaseSessionManager("sqlite+aiosqlite:///:memory:")
+    async with manager.session() as session:
+        assert (await session.execute(text("SELECT 1"))).scalar_one() == 1
+    await manager._engine.dispose()
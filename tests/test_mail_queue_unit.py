@@ -0,0 +1,120 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.services import mail_queue
+
+
+@pytest.mark.asyncio
+async def test_worker_backs_off_and_reconnects_after_redis_errors(monkeypatch):
+    job = orjson.dumps({"task": "send_email", "email": "w@x.com"})
+    redis = MagicMock()
+    redis.blpop = AsyncMock(
+        side_effect=[
+            ConnectionError("down"),
+            TimeoutError("slow"),
+            (mail_queue.MAIL_QUEUE_KEY.encode(), job),
+            ConnectionError("down again"),
+            asyncio.CancelledError(),
+        ]
+    )
+    sleep = AsyncMock()
+    process_job = AsyncMock()
+    close_redis = AsyncMock()
+    monkeypatch.setattr(mail_queue, "get_redis", lambda: redis)
+    monkeypatch.setattr(mail_queue, "close_redis", close_redis)
+    monkeypatch.setattr(mail_queue, "process_job", process_job)
+    monkeypatch.setattr(mail_queue.asyncio, "sleep", sleep)
+
+    with pytest.raises(asyncio.CancelledError):
+        await mail_queue.run_worker()
+
+    process_job.assert_awaited_once_with(job)
+    # Backoff doubles while Redis keeps failing and resets after a success
+    assert [c.args[0] for c in sleep.await_args_list] == [1.0, 2.0, 1.0]
+    close_redis.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_email_uses_redis_queue(monkeypatch):
+    from src.services import mail_queue
+
+    redis = MagicMock()
+    redis.rpush = AsyncMock()
+    monkeypatch.setattr(mail_queue.config, "MAIL_QUEUE_ENABLED", True)
+    monkeypatch.setattr(mail_queue, "get_redis", lambda: redis)
+
+    bg = MagicMock()
+    await mail_queue.enqueue_email(
+        bg, mail_queue.send_email, "q@x.com", "q", "http://test"
+    )
+
+    bg.add_task.assert_not_called()
+    key, payload = redis.rpush.await_args.args
+    assert key == mail_queue.MAIL_QUEUE_KEY
+    assert orjson.loads(payload) == {
+        "task": "send_email",
+        "email": "q@x.com",
+        "username": "q",
+        "host": "http://test",
+    }
+
+    # Redis down -> falls back to in-process background task
+    redis.rpush = AsyncMock(side_effect=Exception("redis down"))
+    await mail_queue.enqueue_email(
+        bg, mail_queue.send_email, "q@x.com", "q", "http://test"
+    )
+    bg.add_task.assert_called_once_with(
+        mail_queue.send_email, "q@x.com", "q", "http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_mail_worker_process_job(monkeypatch):
+    from src.services import mail_queue
+
+    sender = AsyncMock()
+    monkeypatch.setitem(mail_queue._SENDERS, "send_password_reset_email", sender)
+
+    await mail_queue.process_job(
+        orjson.dumps(
+            {
+                "task": "send_password_reset_email",
+                "email": "w@x.com",
+                "username": "w",
+                "host": "http://test",
+            }
+        )
+    )
+    sender.assert_awaited_once_with("w@x.com", "w", "http://test")
+
+    # Unknown or malformed jobs are dropped without raising
+    await mail_queue.process_job(b'{"task": "unknown"}')
+    await mail_queue.process_job(b"not json")
+
+
+def test_mail_worker_imports_without_database(tmp_path):
+    # The worker container only gets mail and Redis settings. Run from an
+    # empty directory so a local .env cannot supply DB_URL.
+    env = {
+        "PATH": os.environ.get("PATH", ""),
+        "PYTHONPATH": str(Path(__file__).resolve().parents[1]),
+        "JWT_SECRET": "secret",
+        "REDIS_HOST": "localhost",
+        "REDIS_PORT": "6379",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.services.mail_queue"],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
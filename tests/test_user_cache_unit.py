@@ -0,0 +1,10 @@
+def test_local_user_cache_hands_out_copies():
+    from src.cache import user_cache
+
+    user_cache._local_users["copy-user"] = {"username": "copy-user"}
+    try:
+        user = user_cache.get_local_user("copy-user")
+        user["username"] = "mutated"
+        assert user_cache.get_local_user("copy-user") == {"username": "copy-user"}
+    finally:
+        user_cache._local_users.pop("copy-user", None)
@@ -1,20 +1,14 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
-
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
 from src.repository.users import UserRepository
+from tests.conftest import async_return, fake_result, make_mock_session
 from src.schemas import UserCreate
 
 
 @pytest.fixture
 def mock_session():
-    mock_session = AsyncMock(spec=AsyncSession)
-    mock_session.add = MagicMock()
-    mock_session.commit = AsyncMock()
-    mock_session.refresh = AsyncMock()
-    return mock_session
+    return make_mock_session()
 
 
 @pytest.fixture
@@ -34,57 +28,62 @@ def user():
     )
 
 
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        pytest.param("get_user_by_id", {"user_id": 1}, id="id"),
+        pytest.param("get_user_by_username", {"username": "testuser"}, id="username"),
+        pytest.param("get_user_by_email", {"email": "user@example.com"}, id="email"),
+        pytest.param(
+            "get_user_by_email_or_username",
+            {"email": "user@example.com", "username": "other"},
+            id="email_or_username",
+        ),
+    ],
+)
 @pytest.mark.asyncio
-async def test_get_user_by_id(user_repository, mock_session, user):
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = user
-    mock_session.execute = AsyncMock(return_value=mock_result)
-
-    res = await user_repository.get_user_by_id(user_id=1)
-
-    assert res is user
-
-
-@pytest.mark.asyncio
-async def test_get_user_by_username(user_repository, mock_session, user):
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = user
-    mock_session.execute = AsyncMock(return_value=mock_result)
+async def test_get_user_lookups(user_repository, mock_session, user, method, kwargs):
+    mock_result = fake_result(scalar=user)
+    mock_session.execute = async_return(mock_result)
 
-    res = await user_repository.get_user_by_username(username="testuser")
+    res = await getattr(user_repository, method)(**kwargs)
 
     assert res is user
+    assert len(mock_session.execute.calls) == 1
 
 
-@pytest.mark.asyncio
-async def test_get_user_by_email(user_repository, mock_session, user):
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = user
-    mock_session.execute = AsyncMock(return_value=mock_result)
-
-    res = await user_repository.get_user_by_email(email="user@example.com")
-
-    assert res is user
+_CREATE_BODY = UserCreate(
+    username="newuser", email="new@example.com", password="secret"
+)
 
 
 @pytest.mark.asyncio
 async def test_create_user(user_repository, mock_session):
-    body = UserCreate(username="newuser", email="new@example.com", password="secret")
+    created = User(
+        id=2,
+        username="newuser",
+        email="new@example.com",
+        hashed_password="secret",
+        avatar="http://avatar",
+    )
+    mock_result = fake_result(scalar=created)
+    mock_session.execute = async_return(mock_result)
 
-    res = await user_repository.create_user(body=body, avatar="http://avatar")
+    res = await user_repository.create_user(body=_CREATE_BODY, avatar="http://avatar")
 
     assert isinstance(res, User)
     assert res.username == "newuser"
-    mock_session.add.assert_called_once()
+    params = mock_session.execute.calls[0][0].compile().params
+    assert params["hashed_password"] == "secret"
+    assert params["avatar"] == "http://avatar"
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(res)
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_confirmed_email_sets_flag(user_repository, mock_session, user):
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = user
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_result = fake_result(scalar=user)
+    mock_session.execute = async_return(mock_result)
 
     await user_repository.confirmed_email(email=user.email)
 
@@ -94,9 +93,8 @@ async def test_confirmed_email_sets_flag(user_repository, mock_session, user):
 
 @pytest.mark.asyncio
 async def test_confirmed_email_no_user_does_nothing(user_repository, mock_session):
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_result = fake_result(scalar=None)
+    mock_session.execute = async_return(mock_result)
 
     await user_repository.confirmed_email(email="noone@example.com")
 
@@ -105,9 +103,8 @@ async def test_confirmed_email_no_user_does_nothing(user_repository, mock_sessio
 
 @pytest.mark.asyncio
 async def test_update_avatar_url(user_repository, mock_session, user):
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = user
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_result = fake_result(scalar=user)
+    mock_session.execute = async_return(mock_result)
 
     res = await user_repository.update_avatar_url(email=user.email, url="http://new")
 
@@ -119,9 +116,8 @@ async def test_update_avatar_url(user_repository, mock_session, user):
 
 @pytest.mark.asyncio
 async def test_update_avatar_url_not_found(user_repository, mock_session):
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_result = fake_result(scalar=None)
+    mock_session.execute = async_return(mock_result)
 
     res = await user_repository.update_avatar_url(
         email="noone@example.com", url="http://no"